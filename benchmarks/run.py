@@ -0,0 +1,193 @@
+"""Micro-benchmarks for the client and coordinator hot paths.
+
+Run from the repository root:
+
+    python -m benchmarks.run            # compare against the saved baseline
+    python -m benchmarks.run --save     # record a new baseline
+
+Each benchmark reports the best observed cost per operation in nanoseconds.
+A benchmark regresses when it is slower than its baseline by more than the
+threshold. Baselines are machine specific, so record one before making a
+change and compare on the same machine afterwards.
+"""
+import argparse
+import asyncio
+from collections.abc import Callable
+import json
+import logging
+from pathlib import Path
+from statistics import median
+import sys
+import tempfile
+import time
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.proflame_connect_wifi.client import ProflameClient
+from custom_components.proflame_connect_wifi.climate import ProflameClimate
+from custom_components.proflame_connect_wifi.const import ApiAttrs, ApiControl
+from custom_components.proflame_connect_wifi.coordinator import ProflameDataCoordinator
+from tools.simulator import DEFAULT_STATE, ProflameSimulator
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_BASELINE = Path(__file__).parent / 'baseline.json'
+DEFAULT_THRESHOLD = 0.2
+
+FULL_FRAMES = [
+    json.dumps({**DEFAULT_STATE, ApiAttrs.OPERATING_MODE: 1, ApiAttrs.FLAME_HEIGHT: 3}),
+    json.dumps({**DEFAULT_STATE, ApiAttrs.OPERATING_MODE: 2, ApiAttrs.FLAME_HEIGHT: 5}),
+]
+PARTIAL_FRAMES = [
+    json.dumps({ApiAttrs.FREE_HEAP: 120000, ApiAttrs.WIFI_SIGNAL_STR: -55}),
+    json.dumps({ApiAttrs.FREE_HEAP: 119500, ApiAttrs.WIFI_SIGNAL_STR: -56}),
+]
+
+
+def _measure(func: Callable[[int], None], number: int, repeat: int) -> float:
+    """Return the best cost per call in nanoseconds across several runs."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        for i in range(number):
+            func(i)
+        elapsed = (time.perf_counter_ns() - start) / number
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def _alternate(handler: Callable[[str], None], frames: list[str]) -> Callable[[int], None]:
+    """Feed alternating frames so that every call carries real changes."""
+    return lambda i: handler(frames[i % len(frames)])
+
+
+async def _micro_benchmarks(number: int, repeat: int) -> dict[str, float]:
+    """Measure the synchronous receive path, coordinator and entity properties."""
+    results = {}
+    hass = HomeAssistant(tempfile.gettempdir())
+
+    client = ProflameClient('benchmark', '127.0.0.1')
+    handle = client._handle_message  # pylint: disable=protected-access
+    results['handle_message.control'] = _measure(lambda i: handle(ApiControl.PONG), number, repeat)
+    results['handle_message.full_frame'] = _measure(_alternate(handle, FULL_FRAMES), number, repeat)
+    results['handle_message.full_frame_unchanged'] = _measure(
+        lambda i: handle(FULL_FRAMES[0]), number, repeat
+    )
+    results['handle_message.partial_frame'] = _measure(
+        _alternate(handle, PARTIAL_FRAMES), number, repeat
+    )
+
+    client = ProflameClient('benchmark', '127.0.0.1')
+    coordinator = ProflameDataCoordinator(hass, client, 'Benchmark')
+    climate = ProflameClimate(coordinator)
+    for _ in range(9):
+        coordinator.async_add_listener(lambda: None)
+    changes = [json.loads(x) for x in FULL_FRAMES]
+    results['coordinator.handle_state_change'] = _measure(
+        _alternate(coordinator.handle_state_change, changes), number, repeat
+    )
+
+    client._handle_message(FULL_FRAMES[1])  # pylint: disable=protected-access
+    results['client.preset'] = _measure(lambda i: client.preset, number, repeat)
+    results['client.target_temperature'] = _measure(
+        lambda i: client.target_temperature, number, repeat
+    )
+
+    def climate_properties(_):
+        return (
+            climate.current_temperature,
+            climate.hvac_action,
+            climate.hvac_mode,
+            climate.max_temp,
+            climate.min_temp,
+            climate.preset_mode,
+            climate.target_temperature,
+            climate.temperature_unit,
+        )
+    results['climate.properties'] = _measure(climate_properties, number, repeat)
+    return results
+
+
+async def _round_trip_benchmark(samples: int) -> dict[str, float]:
+    """Measure command-to-echo latency against a local simulator."""
+    async with ProflameSimulator() as simulator:
+        # Without a coalescing window the fixed batching delay does not hide
+        # changes to the send and echo path
+        client = ProflameClient(
+            'benchmark', simulator.host, simulator.port, coalesce_window=0
+        )
+        await client.open()
+        try:
+            while not client.connected:
+                await asyncio.sleep(0.01)
+            latencies = []
+            for i in range(samples):
+                start = time.perf_counter_ns()
+                await client.async_set_state(ApiAttrs.FAN_SPEED, i % 6 + 1)
+                latencies.append(time.perf_counter_ns() - start)
+        finally:
+            await client.close()
+    latencies.sort()
+    return {
+        'round_trip.median': median(latencies),
+        'round_trip.p95': latencies[int(len(latencies) * 0.95) - 1],
+    }
+
+
+def _compare(results: dict[str, float], baseline: dict[str, float], threshold: float) -> bool:
+    """Report results against the baseline, returning true if nothing regressed."""
+    ok = True
+    for name, value in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            _LOGGER.info('%-40s %14.0f ns   (no baseline)', name, value)
+            continue
+        change = (value - previous) / previous
+        regressed = change > threshold
+        ok = ok and not regressed
+        _LOGGER.info(
+            '%-40s %14.0f ns %+8.1f%%%s',
+            name,
+            value,
+            change * 100,
+            '   REGRESSION' if regressed else '',
+        )
+    return ok
+
+
+async def _run(args: argparse.Namespace) -> dict[str, float]:
+    """Run all benchmarks."""
+    results = await _micro_benchmarks(args.number, args.repeat)
+    if not args.skip_round_trip:
+        results.update(await _round_trip_benchmark(args.samples))
+    return results
+
+
+def main() -> int:
+    """Command line entry point for the benchmark suite."""
+    parser = argparse.ArgumentParser(description='Benchmark the Proflame client hot paths.')
+    parser.add_argument('--baseline', type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument('--number', type=int, default=10000, help='Calls per timing run')
+    parser.add_argument('--repeat', type=int, default=5, help='Timing runs per benchmark')
+    parser.add_argument('--samples', type=int, default=200, help='Round trips to measure')
+    parser.add_argument('--save', action='store_true', help='Store the results as the new baseline')
+    parser.add_argument('--skip-round-trip', action='store_true')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    logging.getLogger('custom_components').setLevel(logging.WARNING)
+    logging.getLogger('websockets').setLevel(logging.WARNING)
+    results = asyncio.run(_run(args))
+
+    baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+    ok = _compare(results, baseline, args.threshold)
+    if args.save:
+        args.baseline.write_text(json.dumps(results, indent=2, sort_keys=True) + '\n')
+        _LOGGER.info('Baseline saved to %s', args.baseline)
+        return 0
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
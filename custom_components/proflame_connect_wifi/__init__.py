@@ -1,13 +1,35 @@
 """The Proflame integration."""
 from __future__ import annotations
 
+import re
+
 from homeassistant.config_entries import ConfigEntry, ConfigType
-from homeassistant.const import CONF_HOST, CONF_PORT, Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.const import CONF_HOST, CONF_PORT, EVENT_HOMEASSISTANT_STOP, Platform
+from homeassistant.core import Event, HomeAssistant
+from homeassistant.exceptions import ConfigEntryNotReady
 
+from .cache import ProflameStateCache
 from .client import ProflameClient
-from .const import DOMAIN, PROFLAME_CLIENT, PROFLAME_COORDINATOR
+from .const import (
+    CONF_COALESCE_WINDOW,
+    CONF_COMMAND_TIMEOUT,
+    CONF_OPTIMISTIC_TIMEOUT,
+    CONF_OUTBOX_POLICY,
+    CONF_RECORD,
+    DEFAULT_COALESCE_WINDOW,
+    DEFAULT_COMMAND_TIMEOUT,
+    DEFAULT_OPTIMISTIC_TIMEOUT,
+    DOMAIN,
+    PROFLAME_CACHE,
+    PROFLAME_CLIENT,
+    PROFLAME_COORDINATOR,
+    PROFLAME_SUPERVISOR,
+    OutboxPolicy,
+)
 from .coordinator import ProflameDataCoordinator
+from .recorder import ProflameRecorder
+from .services import async_setup_services
+from .supervisor import ProflameSupervisor
 
 PLATFORMS: list[Platform] = [
     Platform.CLIMATE,
@@ -22,19 +44,63 @@ PLATFORMS: list[Platform] = [
 
 async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     """Set up Proflame fireplaces."""
+    cache = ProflameStateCache(hass)
+    await cache.async_load()
+    supervisor = ProflameSupervisor()
+    hass.data.setdefault(DOMAIN, {}).update({
+        PROFLAME_CACHE: cache,
+        PROFLAME_SUPERVISOR: supervisor,
+    })
+
+    async def async_stop(event: Event) -> None:
+        """Close every fireplace connection when Home Assistant stops."""
+        await supervisor.async_shutdown()
+
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, async_stop)
+    async_setup_services(hass)
     return True
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Proflame from a config entry."""
 
-    client = ProflameClient(
+    cache: ProflameStateCache = hass.data[DOMAIN][PROFLAME_CACHE]
+    supervisor: ProflameSupervisor = hass.data[DOMAIN][PROFLAME_SUPERVISOR]
+    # Entries for a fireplace that is already connected share its client
+    shared = supervisor.find_client(entry.data[CONF_HOST], entry.data[CONF_PORT])
+    recorder = None
+    if shared is None and entry.options.get(CONF_RECORD):
+        name = re.sub('[^A-Za-z0-9]+', '', entry.unique_id)
+        path = hass.config.path(DOMAIN, f"{name}.jsonl")
+        recorder = await hass.async_add_executor_job(ProflameRecorder.open, path)
+    client = supervisor.acquire_client(
         device_id=entry.unique_id,
         host=entry.data[CONF_HOST],
         port=entry.data[CONF_PORT],
+        recorder=recorder,
+        command_timeout=entry.options.get(CONF_COMMAND_TIMEOUT, DEFAULT_COMMAND_TIMEOUT),
+        outbox_policy=OutboxPolicy(entry.options.get(CONF_OUTBOX_POLICY, OutboxPolicy.EXPIRE)),
+        coalesce_window=entry.options.get(CONF_COALESCE_WINDOW, DEFAULT_COALESCE_WINDOW),
+        optimistic_timeout=entry.options.get(CONF_OPTIMISTIC_TIMEOUT, DEFAULT_OPTIMISTIC_TIMEOUT),
     )
-    await client.open()
 
-    coordinator = ProflameDataCoordinator(hass, client, entry.title)
+    # Entities can start from the last known state while the fireplace connects
+    cached = shared is None and cache.get(client.device_id)
+    if cached:
+        client.restore(cached['state'], cached['settings'])
+    await supervisor.async_open(client)
+    if not cached:
+        try:
+            await client.wait_for_snapshot()
+        except TimeoutError as err:
+            await supervisor.async_release(client)
+            raise ConfigEntryNotReady(
+                f"Timed out waiting for state from {entry.data[CONF_HOST]}"
+            ) from err
+    entry.async_on_unload(cache.track(client))
+    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
+
+    coordinator = ProflameDataCoordinator(hass, client, entry.title, entry.unique_id)
+    entry.async_on_unload(coordinator.async_shutdown)
 
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = {
         PROFLAME_CLIENT: client,
@@ -44,11 +110,21 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     return True
 
+async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload a config entry after its options changed."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
+    supervisor: ProflameSupervisor = hass.data[DOMAIN][PROFLAME_SUPERVISOR]
     client: ProflameClient = hass.data[DOMAIN][entry.entry_id][PROFLAME_CLIENT]
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
         hass.data[DOMAIN].pop(entry.entry_id)
-    await client.close()
+    await supervisor.async_release(client)
 
     return unload_ok
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Forget the cached state of a removed config entry."""
+    cache: ProflameStateCache = hass.data[DOMAIN][PROFLAME_CACHE]
+    cache.remove(entry.unique_id)
@@ -0,0 +1,93 @@
+"""Persistent cache of the last known state of Proflame fireplaces."""
+from collections import Counter
+from collections.abc import Callable, Mapping
+import logging
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .client import ProflameClient
+from .const import CACHE_SAVE_DELAY, CACHE_STORAGE_KEY, CACHE_STORAGE_VERSION, VOLATILE_ATTRS
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ProflameStateCache:
+    """Keeps the last known state of every fireplace in a single store.
+
+    Writes are debounced and shared by all fireplaces, so a burst of changes
+    across the fleet results in a single write of the store.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Create new instance of the ProflameStateCache class."""
+        self._clients: dict[str, ProflameClient] = {}
+        self._devices: dict[str, dict[str, Any]] = {}
+        self._save_pending = False
+        self._store = Store(hass, CACHE_STORAGE_VERSION, CACHE_STORAGE_KEY)
+        self._trackers: Counter[ProflameClient] = Counter()
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Provide the data to write once the save delay has passed."""
+        self._save_pending = False
+        for client in self._clients.values():
+            self._snapshot(client)
+        return {'devices': self._devices}
+
+    @callback
+    def _schedule_save(self) -> None:
+        """Schedule a write unless one is already pending."""
+        if self._save_pending:
+            return
+        self._save_pending = True
+        self._store.async_delay_save(self._data_to_save, CACHE_SAVE_DELAY)
+
+    def _snapshot(self, client: ProflameClient) -> None:
+        """Copy the current state of a client into the cache."""
+        if client.stale:
+            return
+        self._devices[client.device_id] = {
+            'settings': client.stored_settings,
+            'state': dict(client.full_state),
+        }
+
+    async def async_load(self) -> None:
+        """Load the cached state of all fireplaces."""
+        data = await self._store.async_load() or {}
+        self._devices = data.get('devices', {})
+
+    def get(self, device_id: str) -> Mapping[str, Any] | None:
+        """Retrieve the cached state and settings of a fireplace."""
+        return self._devices.get(device_id)
+
+    @callback
+    def track(self, client: ProflameClient) -> Callable[[], None]:
+        """Keep the cache up to date with the state reported to a client."""
+        def update(changes: Mapping[str, int]) -> None:
+            if any(x not in VOLATILE_ATTRS for x in changes):
+                self._schedule_save()
+
+        def untrack() -> None:
+            remove_callback()
+            self._trackers[client] -= 1
+            if self._trackers[client] > 0:
+                return
+            del self._trackers[client]
+            if self._clients.get(client.device_id) is client:
+                del self._clients[client.device_id]
+                self._snapshot(client)
+                self._schedule_save()
+
+        self._clients[client.device_id] = client
+        self._trackers[client] += 1
+        remove_callback = client.register_batch_callback(update)
+        return untrack
+
+    @callback
+    def remove(self, device_id: str) -> None:
+        """Forget the cached state of a fireplace."""
+        self._clients.pop(device_id, None)
+        if self._devices.pop(device_id, None) is not None:
+            self._schedule_save()
@@ -1,9 +1,16 @@
 """Provides high level abstractions for interacting with Proflame fireplaces."""
+import asyncio
+from collections.abc import Mapping
+from dataclasses import dataclass
+
 from homeassistant.components.climate import HVACAction, HVACMode, UnitOfTemperature
 
 from .client_base import ProflameClientBase
 from .const import (
     ADJUSTABLE_MODES,
+    DEFAULT_COALESCE_WINDOW,
+    DEFAULT_COMMAND_TIMEOUT,
+    DEFAULT_OPTIMISTIC_TIMEOUT,
     MAX_FAN_SPEED,
     MAX_FLAME_HEIGHT,
     MAX_LIGHT_BRIGHTNESS,
@@ -12,18 +19,64 @@ from .const import (
     MIN_LIGHT_BRIGHTNESS,
     ApiAttrs,
     OperatingMode,
+    OutboxPolicy,
     PilotMode,
     Preset,
 )
 from .util import Temperature, constrain
 
 
+@dataclass(frozen=True, slots=True)
+class ProflameDerivedState:
+    """Immutable view of state derived from a single version of raw state."""
+
+    version: int
+    current_temperature: float | None
+    fan_speed: int | None
+    flame_height: int | None
+    hvac_action: HVACAction
+    hvac_mode: HVACMode
+    light_brightness: int | None
+    operating_mode: OperatingMode | None
+    pilot_mode: PilotMode | None
+    preset: Preset | None
+    target_temperature: float | None
+    temperature_unit: UnitOfTemperature
+
+
 class ProflameClient(ProflameClientBase):
     """Client used for interacting with Proflame fireplaces."""
 
-    def __init__(self, device_id, host, port=None, logger=None) -> None:
+    def __init__(
+        self,
+        device_id,
+        host,
+        port=None,
+        logger=None,
+        optimistic_timeout=DEFAULT_OPTIMISTIC_TIMEOUT,
+        coalesce_window=DEFAULT_COALESCE_WINDOW,
+        connect_gate=None,
+        recorder=None,
+        command_timeout=DEFAULT_COMMAND_TIMEOUT,
+        outbox_policy=OutboxPolicy.EXPIRE,
+    ) -> None:
         """Create new class instance."""
-        super().__init__(device_id, host, port, logger)
+        super().__init__(
+            device_id,
+            host,
+            port,
+            logger,
+            coalesce_window=coalesce_window,
+            connect_gate=connect_gate,
+            recorder=recorder,
+            command_timeout=command_timeout,
+            outbox_policy=outbox_policy,
+        )
+        self._derived = None
+        self._optimistic = {}
+        self._command_timeout = command_timeout
+        self._optimistic_timeout = optimistic_timeout
+        self._outbox_policy = outbox_policy
         self._stored_fan_speed = MAX_FAN_SPEED
         self._stored_flame = MAX_FLAME_HEIGHT
         self._stored_light_brightness = MAX_LIGHT_BRIGHTNESS
@@ -31,8 +84,43 @@ class ProflameClient(ProflameClientBase):
         self._stored_mode_adjustable = OperatingMode.MANUAL
         self.register_callback(self._track_state)
 
+    def _clear_optimistic(self, field: str) -> bool:
+        """Drop the optimistic value of a field, returning true if one existed."""
+        pending = self._optimistic.pop(field, None)
+        if pending is None:
+            return False
+        if pending[1] is not None:
+            pending[1].cancel()
+        self._version += 1
+        return True
+
+    def _update_state(self, changes: Mapping[str, int]) -> None:
+        """Drop optimistic values confirmed by the device before applying changes."""
+        for field, value in changes.items():
+            pending = self._optimistic.get(field)
+            if pending is not None and pending[0] == value:
+                self._clear_optimistic(field)
+        super()._update_state(changes)
+
+    def _discard(self, writes: Mapping[str, int]) -> None:
+        """Revert the optimistic values of writes that will not be sent."""
+        for field, value in writes.items():
+            pending = self._optimistic.get(field)
+            # A newer write to the same field may still be pending
+            if pending is not None and pending[0] == value and self._clear_optimistic(field):
+                self._notify({field: super().get_state(field)})
+
+    def _rollback(self, field: str) -> None:
+        """Revert an optimistic value the device never confirmed."""
+        if not self._clear_optimistic(field):
+            return
+        self._logger.debug('Write to %s was not confirmed, reverting', field)
+        self._notify({field: super().get_state(field)})
+
     def _track_state(self, key, value) -> None:
         """Track specific state changes to provide enhanced functionality."""
+        if not value:
+            return
         if key == ApiAttrs.FAN_SPEED and value > 0:
             self._stored_fan_speed = value
         if key == ApiAttrs.FLAME_HEIGHT and value > 0:
@@ -45,98 +133,189 @@ class ProflameClient(ProflameClientBase):
             if value in ADJUSTABLE_MODES and self.flame_height != 0:
                 self._stored_mode_adjustable = value
 
+    async def close(self) -> None:
+        """Close the websocket connection and forget unconfirmed writes."""
+        for field in list(self._optimistic):
+            self._clear_optimistic(field)
+        await super().close()
+
+    def get_state(self, field: str) -> int | None:
+        """Query the state of the fireplace, including unconfirmed writes."""
+        pending = self._optimistic.get(field)
+        if pending is not None:
+            return pending[0]
+        return super().get_state(field)
+
+    def restore(self, state: Mapping[str, int], settings: Mapping[str, int] | None = None) -> None:
+        """Seed the client with previously known state and remembered settings."""
+        if self.has_snapshot:
+            return
+        super().restore(state)
+        settings = settings or {}
+        self._stored_fan_speed = settings.get('fan_speed', self._stored_fan_speed)
+        self._stored_flame = settings.get('flame_height', self._stored_flame)
+        self._stored_light_brightness = settings.get('light_brightness', self._stored_light_brightness)
+        self._stored_mode = settings.get('mode', self._stored_mode)
+        self._stored_mode_adjustable = settings.get('mode_adjustable', self._stored_mode_adjustable)
+
+    def set_state(self, field: str, value: int) -> None:
+        """Send a state update to the fireplace and show it until confirmed."""
+        super().set_state(field, value)
+        if value == super().get_state(field):
+            if self._clear_optimistic(field):
+                self._notify({field: value})
+            return
+        unchanged = self.get_state(field) == value
+        self._clear_optimistic(field)
+        # Queued writes are rolled back by the outbox when they expire or are
+        # dropped. The timer only covers a queue that never gets to run.
+        delay = None
+        if self._outbox_policy != OutboxPolicy.KEEP:
+            delay = self._command_timeout + self._optimistic_timeout
+        self._set_optimistic(field, value, delay)
+        if not unchanged:
+            self._notify({field: value})
+
+    def _sent(self, writes: Mapping[str, int]) -> None:
+        """Give sent writes the optimistic timeout to be confirmed."""
+        for field, value in writes.items():
+            pending = self._optimistic.get(field)
+            if pending is not None and pending[0] == value:
+                self._set_optimistic(field, value, self._optimistic_timeout)
+
+    def _set_optimistic(self, field: str, value: int, timeout: float | None) -> None:
+        """Show a value until it is confirmed or the timeout passes."""
+        pending = self._optimistic.get(field)
+        if pending is not None and pending[1] is not None:
+            pending[1].cancel()
+        handle = None
+        if timeout is not None:
+            handle = asyncio.get_running_loop().call_later(timeout, self._rollback, field)
+        self._optimistic[field] = (value, handle)
+
+    def _derive(self) -> ProflameDerivedState:
+        """Calculate all derived state from the current raw state."""
+        mode = self.get_state(ApiAttrs.OPERATING_MODE)
+        off = mode in [None, OperatingMode.OFF]
+        flame_height = 0 if off else self.get_state(ApiAttrs.FLAME_HEIGHT)
+
+        if mode == OperatingMode.OFF:
+            preset = Preset.OFF
+        elif mode == OperatingMode.MANUAL and flame_height == 0:
+            preset = Preset.OFF
+        elif mode == OperatingMode.MANUAL:
+            preset = Preset.MANUAL
+        elif mode == OperatingMode.THERMOSTAT:
+            preset = Preset.THERMOSTAT
+        elif mode == OperatingMode.SMART:
+            preset = Preset.SMART
+        else:
+            preset = None
+
+        current = self.get_state(ApiAttrs.CURRENT_TEMPERATURE)
+        target = self.get_state(ApiAttrs.TARGET_TEMPERATURE)
+        if preset in [Preset.MANUAL, Preset.OFF]:
+            target = None
+        unit = self.get_state(ApiAttrs.TEMPERATURE_UNIT) or 0
+
+        return ProflameDerivedState(
+            version=self.state_version,
+            current_temperature=current / 10 if current else None,
+            fan_speed=0 if off else self.get_state(ApiAttrs.FAN_SPEED),
+            flame_height=flame_height,
+            hvac_action=HVACAction.OFF if preset == Preset.OFF else HVACAction.HEATING,
+            hvac_mode=HVACMode.OFF if preset == Preset.OFF else HVACMode.HEAT,
+            light_brightness=0 if off else self.get_state(ApiAttrs.LIGHT_BRIGHTNESS),
+            operating_mode=mode,
+            pilot_mode=self.get_state(ApiAttrs.PILOT_MODE),
+            preset=preset,
+            target_temperature=target / 10 if target else None,
+            temperature_unit=(
+                UnitOfTemperature.CELSIUS if unit == 0 else UnitOfTemperature.FAHRENHEIT
+            ),
+        )
+
     @property
     def current_temperature(self) -> float | None:
         """Get the current temperature reported by the unit."""
-        temperature = self.get_state(ApiAttrs.CURRENT_TEMPERATURE)
-        if temperature:
-            return temperature / 10
-        return None
+        return self.derived.current_temperature
+
+    @property
+    def derived(self) -> ProflameDerivedState:
+        """Get derived state, calculated at most once per state change."""
+        derived = self._derived
+        if derived is None or derived.version != self.state_version:
+            derived = self._derived = self._derive()
+        return derived
 
     @property
     def fan_speed(self) -> int:
         """Get the current state of the fan."""
-        if self.operating_mode in [None, OperatingMode.OFF]:
-            return 0
-        return self.get_state(ApiAttrs.FAN_SPEED)
+        return self.derived.fan_speed
 
     @property
     def flame_height(self) -> int | None:
         """Get the configured height of the flame."""
-        if self.operating_mode in [None, 0]:
-            return 0
-        return self.get_state(ApiAttrs.FLAME_HEIGHT)
+        return self.derived.flame_height
 
     @property
     def hvac_action(self) -> HVACAction | None:
         """Get the current HVAC heating status."""
-        if self.preset == Preset.OFF:
-            return HVACAction.OFF
-        return HVACAction.HEATING
+        return self.derived.hvac_action
 
     @property
     def hvac_mode(self) -> HVACMode | None:
         """Get the current HVAC heating status."""
-        if self.preset == Preset.OFF:
-            return HVACMode.OFF
-        return HVACMode.HEAT
+        return self.derived.hvac_mode
 
     @property
     def light_brightness(self) -> int | None:
         """Get the current state of the primary light."""
-        if self.operating_mode in [None, OperatingMode.OFF]:
-            return 0
-        return self.get_state(ApiAttrs.LIGHT_BRIGHTNESS)
+        return self.derived.light_brightness
 
     @property
     def operating_mode(self) -> OperatingMode | None:
         """Get the current low level operating mode of the fireplace."""
-        return self.get_state(ApiAttrs.OPERATING_MODE)
+        return self.derived.operating_mode
 
     @property
     def pilot_mode(self) -> PilotMode | None:
         """Get the current pilot mode of the fireplace."""
-        return self.get_state(ApiAttrs.PILOT_MODE)
+        return self.derived.pilot_mode
 
     @property
     def preset(self) -> Preset | None:
         """Get the current state of the fireplace as represented by a preset."""
-        cur_mode = self.operating_mode
-        if cur_mode == OperatingMode.OFF:
-            return Preset.OFF
-        if cur_mode == OperatingMode.MANUAL and self.flame_height == 0:
-            return Preset.OFF
-        if cur_mode == OperatingMode.MANUAL:
-            return Preset.MANUAL
-        if cur_mode == OperatingMode.THERMOSTAT:
-            return Preset.THERMOSTAT
-        if cur_mode == OperatingMode.SMART:
-            return Preset.SMART
+        return self.derived.preset
+
+    @property
+    def stored_settings(self) -> dict[str, int]:
+        """Retrieve the settings remembered for turning features back on."""
+        return {
+            'fan_speed': self._stored_fan_speed,
+            'flame_height': self._stored_flame,
+            'light_brightness': self._stored_light_brightness,
+            'mode': self._stored_mode,
+            'mode_adjustable': self._stored_mode_adjustable,
+        }
 
     @property
     def target_temperature(self) -> float | None:
         """The current temperature the device is trying to hit."""
-        temperature = self.get_state(ApiAttrs.TARGET_TEMPERATURE)
-        if self.preset in [Preset.MANUAL, Preset.OFF]:
-            return None
-        if temperature:
-            return temperature / 10
-        return None
+        return self.derived.target_temperature
 
     @property
     def temperature_unit(self) -> UnitOfTemperature:
         """The temperature unit the device is configured for."""
-        unit = self.get_state(ApiAttrs.TEMPERATURE_UNIT) or 0
-        if unit == 0:
-            return UnitOfTemperature.CELSIUS
-        return UnitOfTemperature.FAHRENHEIT
+        return self.derived.temperature_unit
 
     def heat(self) -> None:
         """Set the fireplace to the last heat generating configuration."""
         if self.preset != Preset.OFF:
             return
-        self.set_operating_mode(self._stored_mode)
-        self.set_flame_height(self._stored_flame)
+        with self.transaction():
+            self.set_operating_mode(self._stored_mode)
+            self.set_flame_height(self._stored_flame)
 
     def is_on(self) -> bool | None:
         """Return true if the fireplace is on."""
@@ -151,13 +330,14 @@ class ProflameClient(ProflameClientBase):
     def set_flame_height(self, height: int) -> None:
         """Set the height of the flame in manual mode."""
         constrained = constrain(height, MIN_FLAME_HEIGHT, MAX_FLAME_HEIGHT)
-        self.set_state(ApiAttrs.FLAME_HEIGHT, constrained)
-        if constrained > 0 and self.operating_mode not in ADJUSTABLE_MODES:
-            self.set_operating_mode(self._stored_mode_adjustable)
+        with self.transaction():
+            self.set_state(ApiAttrs.FLAME_HEIGHT, constrained)
+            if constrained > 0 and self.operating_mode not in ADJUSTABLE_MODES:
+                self.set_operating_mode(self._stored_mode_adjustable)
 
     def set_light_brightness(self, brightness: int) -> None:
         """Set the brightness of the primary light."""
-        constrained = constrain(brightness, MAX_LIGHT_BRIGHTNESS, MIN_LIGHT_BRIGHTNESS)
+        constrained = constrain(brightness, MIN_LIGHT_BRIGHTNESS, MAX_LIGHT_BRIGHTNESS)
         self.set_state(ApiAttrs.LIGHT_BRIGHTNESS, constrained)
 
     def set_operating_mode(self, mode: OperatingMode) -> None:
@@ -170,18 +350,19 @@ class ProflameClient(ProflameClientBase):
 
     def set_preset(self, preset: Preset):
         """Set the fireplace state based on a preset."""
-        if preset == Preset.OFF:
-            if self.operating_mode != OperatingMode.OFF:
-                self.set_flame_height(0)
+        with self.transaction():
+            if preset == Preset.OFF:
+                if self.operating_mode != OperatingMode.OFF:
+                    self.set_flame_height(0)
+                    self.set_operating_mode(OperatingMode.MANUAL)
+            if preset == Preset.MANUAL:
+                if self.flame_height == 0:
+                    self.set_flame_height(self._stored_flame)
                 self.set_operating_mode(OperatingMode.MANUAL)
-        if preset == Preset.MANUAL:
-            if self.flame_height == 0:
-                self.set_flame_height(self._stored_flame)
-            self.set_operating_mode(OperatingMode.MANUAL)
-        if preset == Preset.THERMOSTAT:
-            self.set_operating_mode(OperatingMode.THERMOSTAT)
-        if preset == Preset.SMART:
-            self.set_operating_mode(OperatingMode.SMART)
+            if preset == Preset.THERMOSTAT:
+                self.set_operating_mode(OperatingMode.THERMOSTAT)
+            if preset == Preset.SMART:
+                self.set_operating_mode(OperatingMode.SMART)
 
     def set_target_temperature(self, temperature: Temperature) -> None:
         """Set the desired temperature for themostat based modes."""
@@ -1,57 +1,235 @@
 """Low level functionality for interacting with Proflame fireplaces."""
 import asyncio
+from collections import deque
+from collections.abc import AsyncIterator, Callable, Iterator, Mapping
+from contextlib import (
+    AbstractAsyncContextManager,
+    asynccontextmanager,
+    contextmanager,
+    nullcontext,
+)
+from contextvars import ContextVar
 import json
-from json.decoder import JSONDecodeError
 import logging
-
-from websockets import ConnectionClosed, ConnectionClosedError
-from websockets.client import connect
-
-from .const import DEFAULT_PORT, ApiControl
+import random
+from statistics import fmean
+import time
+
+from websockets import ConnectionClosed, WebSocketException
+from websockets.client import WebSocketClientProtocol, connect
+
+from .const import (
+    ACK_LATENCY_SAMPLES,
+    BACKOFF_INITIAL,
+    BACKOFF_MAX,
+    BACKOFF_STABLE_TIME,
+    DEFAULT_ACK_TIMEOUT,
+    DEFAULT_COALESCE_WINDOW,
+    DEFAULT_COMMAND_TIMEOUT,
+    DEFAULT_PORT,
+    HANDSHAKE_TIMEOUT,
+    KEEPALIVE_INTERVAL,
+    KEEPALIVE_MAX_INTERVAL,
+    KEEPALIVE_MIN_INTERVAL,
+    KEEPALIVE_MISSED_PONGS,
+    KEEPALIVE_RTT_SAMPLES,
+    KEEPALIVE_RTT_THRESHOLD,
+    ORDER_SENSITIVE_ATTRS,
+    RECORD_RECV,
+    RECORD_SEND,
+    SNAPSHOT_TIMEOUT,
+    STALE_TIMEOUT,
+    WARM_CONNECTION_TTL,
+    ApiControl,
+    ConnectionState,
+    OutboxPolicy,
+)
+from .decoder import FrameKind, classify, decode_state
+from .metrics import ProflameMetrics
+from .outbox import ProflameOutbox
+from .state import ProflameStateSnapshot, ProflameStateStore
+from .util import ProflameLogger
 
 _LOGGER = logging.getLogger(__name__)
 
+# Collects acknowledgement futures for writes made inside ProflameClientBase.confirm
+_ACK_SCOPE: ContextVar[list[asyncio.Future] | None] = ContextVar('proflame_ack_scope', default=None)
+
+# Raw frame tracing is opt-in and stays quiet when only debug logging is enabled
+_WIRE_LOGGER = _LOGGER.getChild('wire')
+if _WIRE_LOGGER.level == logging.NOTSET:
+    _WIRE_LOGGER.setLevel(logging.INFO)
+
+# Validated connections waiting to be adopted by a client, keyed by URI
+_WARM_CONNECTIONS: dict[str, tuple[WebSocketClientProtocol, asyncio.TimerHandle]] = {}
+_CLOSING: set[asyncio.Task] = set()
+
+
+def _close_later(websocket: WebSocketClientProtocol) -> None:
+    """Close a websocket in the background."""
+    task = asyncio.get_running_loop().create_task(websocket.close())
+    _CLOSING.add(task)
+    task.add_done_callback(_CLOSING.discard)
+
+
+def _expire_connection(uri: str, websocket: WebSocketClientProtocol) -> None:
+    """Close a warm connection that was not adopted in time."""
+    if _WARM_CONNECTIONS.get(uri, (None,))[0] is websocket:
+        del _WARM_CONNECTIONS[uri]
+        _LOGGER.debug("Closing unused Proflame connection to '%s'", uri)
+        _close_later(websocket)
+
+
+def _park_connection(uri: str, websocket: WebSocketClientProtocol) -> None:
+    """Keep a handshaken connection open for a client to adopt."""
+    previous = _WARM_CONNECTIONS.pop(uri, None)
+    if previous is not None:
+        previous[1].cancel()
+        _close_later(previous[0])
+    handle = asyncio.get_running_loop().call_later(
+        WARM_CONNECTION_TTL, _expire_connection, uri, websocket
+    )
+    _WARM_CONNECTIONS[uri] = (websocket, handle)
+
+
+def _adopt_connection(uri: str) -> WebSocketClientProtocol | None:
+    """Take the warm connection to a URI if one is still open."""
+    websocket, handle = _WARM_CONNECTIONS.pop(uri, (None, None))
+    if websocket is None:
+        return None
+    handle.cancel()
+    if not websocket.open:
+        return None
+    return websocket
+
+
+def _merge_writes(writes: list[dict[str, int]]) -> list[dict[str, int]]:
+    """Merge queued writes into as few frames as possible.
+
+    Writes are merged last-write-wins per field. A field listed in
+    ORDER_SENSITIVE_ATTRS is only overwritten in place if no other order
+    sensitive field was written after it, otherwise a new frame is started so
+    the device still sees the writes in the order they were requested. A write
+    of several fields, made by a transaction, is never split: it starts a new
+    frame if any of its order sensitive fields is already in the current one.
+    """
+    frames = [{}]
+    for write in writes:
+        frame = frames[-1]
+        if len(write) > 1:
+            split = any(x in frame for x in write if x in ORDER_SENSITIVE_ATTRS)
+        else:
+            field = next(iter(write))
+            split = False
+            if field in frame and field in ORDER_SENSITIVE_ATTRS:
+                fields = list(frame)
+                later = fields[fields.index(field) + 1:]
+                split = any(x in ORDER_SENSITIVE_ATTRS for x in later)
+        if split:
+            frame = {}
+            frames.append(frame)
+        frame.update(write)
+    return frames
+
 
 class ProflameClientBase:
     """Client used for interacting with Proflame fireplaces."""
 
     @staticmethod
-    async def test_connection(host: str, port: int | None = None) -> bool:
-        """Test the connection to the fireplace."""
+    async def test_connection(host: str, port: int | None = None, handoff: bool = False) -> bool:
+        """Test the connection to the fireplace.
 
+        With handoff, a successful connection is kept open for a short while
+        so the first client connecting to the same fireplace can adopt it
+        instead of repeating the handshake.
+        """
+
+        uri = f"ws://{host}:{port or DEFAULT_PORT}"
+        ws = None
         try:
-            uri = f"ws://{host}:{port or DEFAULT_PORT}"
-            async with connect(uri) as ws:
-                await ws.send(ApiControl.CONN_SYN)
-                response = await ws.recv()
-
-                if response == ApiControl.CONN_ACK:
-                    _LOGGER.debug("Proflame connection to '%s' established")
-                    return True
-                else:
-                    msg = "Proflame connection test to '%s' failed with unexpected response (%s)"
-                    _LOGGER.error(msg, uri, response)
-                    return False
+            ws = await connect(uri, ping_interval=None)
+            await ws.send(ApiControl.CONN_SYN)
+            response = await ws.recv()
+
+            if response == ApiControl.CONN_ACK:
+                _LOGGER.debug("Proflame connection to '%s' established", uri)
+                if handoff:
+                    _park_connection(uri, ws)
+                    ws = None
+                return True
+            else:
+                msg = "Proflame connection test to '%s' failed with unexpected response (%s)"
+                _LOGGER.error(msg, uri, response)
+                return False
         except Exception: # pylint: disable=broad-exception-caught
             msg = "Encountered error while testing Proflame connection '%s'"
             _LOGGER.exception(msg, uri)
             return False
-
-    def __init__(self, device_id, host, port=None, logger=None, auto_reconnect=True) -> None:
+        finally:
+            if ws is not None:
+                await ws.close()
+
+    def __init__(
+        self,
+        device_id,
+        host,
+        port=None,
+        logger=None,
+        auto_reconnect=True,
+        coalesce_window=DEFAULT_COALESCE_WINDOW,
+        command_timeout=DEFAULT_COMMAND_TIMEOUT,
+        outbox_policy=OutboxPolicy.EXPIRE,
+        connect_gate: Callable[[], AbstractAsyncContextManager] | None = None,
+        recorder=None,
+    ) -> None:
         """Create new class instance."""
         self._auto_reconnect = auto_reconnect
+        self._coalesce_window = coalesce_window
+        self._connect_gate = connect_gate or nullcontext
         self._device_id = device_id
         self._host = host
         self._port = port or DEFAULT_PORT
-        self._logger = logger or _LOGGER
+        self._recorder = recorder
+        self._logger = ProflameLogger.for_host(logger or _LOGGER, host)
+        self._wire = ProflameLogger.for_host(_WIRE_LOGGER, host)
         self._callbacks = []
+        self._metrics = ProflameMetrics()
 
         self._ws = None
         self._shutdown = False
-        self._queue = asyncio.Queue()
+        self._outbox = ProflameOutbox(
+            command_timeout, outbox_policy, logger=self._logger, on_drop=self._discard
+        )
+        self._transaction = None
         self._connection = None
-
-        self._state = {}
+        self._connection_callbacks = []
+        self._connection_state = ConnectionState.CLOSED
+
+        self._last_frame = 0.0
+        self._last_recv = 0.0
+        self._missed_pongs = 0
+        self._peer_dead = False
+        self._ping_interval = KEEPALIVE_INTERVAL
+        self._ping_sent = None
+        self._pings_outstanding = 0
+        self._rtts = deque(maxlen=KEEPALIVE_RTT_SAMPLES)
+
+        self._flushes = 0
+        self._frames_sent = 0
+        self._last_flush_frames = 0
+        self._writes_sent = 0
+
+        self._dialing = asyncio.Event()
+        self._restored = False
+        self._snapshot = asyncio.Event()
+        self._stale_expired = False
+        self._stale_expiry: asyncio.Task | None = None
+        self._state = ProflameStateStore()
+        self._suppressed_updates = 0
+        self._version = 0
+
+        self._ack_latencies = deque(maxlen=ACK_LATENCY_SAMPLES)
+        self._waiters = {}
 
     def __enter__(self):
         """Initiate a connection for a context manager."""
@@ -62,115 +240,366 @@ class ProflameClientBase:
         """Clean up on context manager exit."""
         self.close()
 
+    def _backoff_delay(self, attempt: int) -> float:
+        """Calculate a jittered exponential delay before the next connection attempt."""
+        delay = min(BACKOFF_MAX, BACKOFF_INITIAL * 2 ** attempt)
+        return random.uniform(delay / 2, delay)
+
     async def _connect(self):
         """Maintain an open connection to the websocket."""
-        tasks = []
+        attempt = 0
         try:
-            async for websocket in connect(self.uri, ping_interval=None):
-                self._debug('Connection opened')
+            while True:
+                self._set_connection_state(ConnectionState.CONNECTING)
                 try:
-                    self._ws = websocket
-                    if not tasks:
-                        tasks = [
-                            asyncio.create_task(self._dispatcher()),
-                            asyncio.create_task(self._listener()),
-                            asyncio.create_task(self._keepalive()),
-                        ]
-                    await self._send(ApiControl.CONN_SYN)
-                    await asyncio.gather(*tasks, return_exceptions=True)
-                except (ConnectionClosed, ConnectionClosedError):
-                    msg = 'Attempting to reopen after connection closed unexpectedly'
-                    self._warning(msg)
-        except asyncio.CancelledError:
-            for task in tasks or []:
+                    started = time.monotonic()
+                    self._ws = _adopt_connection(self.uri)
+                    if self._ws is not None:
+                        self._dialing.set()
+                        self._logger.debug('Adopted validated connection')
+                    else:
+                        async with self._connect_gate(), asyncio.timeout(HANDSHAKE_TIMEOUT):
+                            # Time spent queued for the gate is not part of the handshake
+                            started = time.monotonic()
+                            self._dialing.set()
+                            self._ws = await connect(self.uri, ping_interval=None)
+                            self._logger.debug('Connection opened')
+                            self._set_connection_state(ConnectionState.HANDSHAKING)
+                            await self._handshake()
+                except (OSError, TimeoutError, WebSocketException) as err:
+                    self._logger.warning('Unable to establish connection (%s)', repr(err))
+                else:
+                    if self._metrics.handshake_time.count:
+                        self._metrics.reconnects += 1
+                    self._metrics.handshake_time.observe(time.monotonic() - started)
+                    self._outbox.resume()
+                    self._set_connection_state(ConnectionState.READY)
+                    ready = time.monotonic()
+                    await self._run_connection()
+                    # Only a connection that stayed up resets the backoff, so a
+                    # fireplace that drops every connection is not redialed in a loop
+                    if time.monotonic() - ready >= BACKOFF_STABLE_TIME:
+                        attempt = 0
+                    self._set_connection_state(ConnectionState.BACKOFF)
+                # A dead peer will never answer a closing handshake
+                await self._disconnect(abort=self._peer_dead)
+                self._peer_dead = False
+
+                if self._shutdown or not self._auto_reconnect:
+                    break
+                delay = self._backoff_delay(attempt)
+                attempt += 1
+                self._set_connection_state(ConnectionState.BACKOFF)
+                self._logger.debug('Reconnecting in %.1f seconds', delay)
+                await asyncio.sleep(delay)
+        finally:
+            self._dialing.set()
+            await self._disconnect()
+            self._set_connection_state(ConnectionState.CLOSED)
+
+    async def _disconnect(self, abort: bool = False) -> None:
+        """Close the websocket of the current connection if one is open."""
+        websocket, self._ws = self._ws, None
+        if websocket is None:
+            return
+        if abort:
+            websocket.transport.abort()
+        else:
+            await websocket.close()
+
+    async def _handshake(self) -> None:
+        """Open the Proflame session and wait for it to be acknowledged."""
+        await self._send(ApiControl.CONN_SYN)
+        while True:
+            message = await self._ws.recv()
+            self._received(message)
+            self._handle_message(message)
+            if message == ApiControl.CONN_ACK:
+                return
+
+    async def _run_connection(self) -> None:
+        """Run the tasks scoped to a single connection until one of them stops."""
+        listener = asyncio.create_task(self._listener())
+        tasks = [
+            asyncio.create_task(self._dispatcher()),
+            listener,
+            asyncio.create_task(self._keepalive()),
+        ]
+        try:
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in tasks:
                 task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        for task in done:
+            err = task.exception()
+            if err is None and task is listener:
+                self._logger.warning('Connection closed by the fireplace')
+            elif err is None:
+                continue
+            elif isinstance(err, ConnectionClosed):
+                self._logger.warning('Connection closed unexpectedly (%s)', err)
+            else:
+                self._logger.error('Connection task failed', exc_info=err)
+
+    def _set_connection_state(self, state: ConnectionState) -> None:
+        """Move the connection to a new state and notify listeners."""
+        if state == self._connection_state:
+            return
+        self._logger.debug('Connection state %s -> %s', self._connection_state, state)
+        self._connection_state = state
+        for callback in self._connection_callbacks:
+            callback(state)
+
+    async def _collect(self) -> None:
+        """Wait for queued writes and coalesce everything pending into frames."""
+        commands = []
+        while not commands:
+            await self._outbox.wait()
+            if self._coalesce_window > 0:
+                await asyncio.sleep(self._coalesce_window)
+            commands = self._outbox.take()
+        writes = [x.data for x in commands]
+        self._metrics.queue_depth.observe(len(writes))
+        self._metrics.queue_wait.observe(time.monotonic() - min(x.queued for x in commands))
+
+        frames = _merge_writes(writes)
+        self._outbox.push_frames(frames, max(x.deadline for x in commands))
+        self._flushes += 1
+        self._frames_sent += len(frames)
+        self._last_flush_frames = len(frames)
+        self._writes_sent += len(writes)
 
     async def _dispatcher(self) -> None:
-        """Handle the sending of messages in an interruption safe way."""
-        item = None
+        """Send queued writes, keeping unsent frames for the next connection."""
         while True:
-            try:
-                if item is None:
-                    item = await self._queue.get()
-                await self._send(json.dumps(item))
-                self._queue.task_done()
-                item = None
-            except asyncio.CancelledError:
-                break
-            except Exception: # pylint: disable=broad-exception-caught
-                self._exception('Unexpected error during send')
-                await asyncio.sleep(1)
+            frame = self._outbox.frame()
+            if frame is None:
+                await self._collect()
+                continue
+            frame.attempts += 1
+            await self._send(json.dumps(frame.data))
+            self._outbox.pop_frame()
+            self._sent(frame.data)
 
     def _handle_control_message(self, message):
         """Process a system control/info message from the websocket."""
         if message == ApiControl.CONN_ACK:
-            self._debug('Connection acknowledged')
+            self._logger.debug('Connection acknowledged')
         elif message == ApiControl.PONG:
-            self._debug('Ping acknowledged')
-        else:
-            self._warning("Received unexpected control message (%s)", message)
-
-    def _handle_json_message(self, message) -> None:
-        """Process a system state message from the websocket."""
-        err_msg = "Received unexpected JSON message (%s) - %s"
-        if not isinstance(message, dict):
-            self._warning(err_msg, "NOT_AN_OBJECT", json.dumps(message))
-        elif any(not isinstance(x, int) for x in message.values()):
-            self._warning(err_msg, "UNKNOWN_SCHEMA", json.dumps(message))
+            self._handle_pong()
         else:
-            for k, v in message.items():
-                self._state[k] = v
-                for callback in self._callbacks:
-                    callback(k, v)
+            self._logger.warning("Received unexpected control message (%s)", message)
+
+    def _handle_json_message(self, message: Mapping[str, int]) -> None:
+        """Process validated state reported by the fireplace."""
+        if self._waiters:
+            self._confirm_writes(message)
+        self._last_frame = time.monotonic()
+        if not self._snapshot.is_set():
+            # The first live report replaces anything restored from a cache
+            self._snapshot.set()
+            self._update_state(message)
+            return
+        changes = self._state.diff(message)
+        self._suppressed_updates += len(message) - len(changes)
+        if changes:
+            self._update_state(changes)
+
+    def _confirm_writes(self, message: Mapping[str, int]) -> None:
+        """Resolve acknowledgement waiters for fields echoed by the device."""
+        for field, value in message.items():
+            waiter = self._waiters.get(field)
+            if waiter is None or waiter[0] != value:
+                continue
+            del self._waiters[field]
+            self._ack_latencies.append(time.monotonic() - waiter[1])
+            for future in waiter[2]:
+                if not future.done():
+                    future.set_result(None)
+
+    def _discard(self, writes: Mapping[str, int]) -> None:
+        """Undo local effects of staged or queued writes that will not be sent."""
+
+    def _sent(self, writes: Mapping[str, int]) -> None:
+        """Track writes that were just sent to the fireplace."""
+
+    def _expect(self, field: str, value: int) -> asyncio.Future:
+        """Create a future that is resolved when the device reports a written value."""
+        future = asyncio.get_running_loop().create_future()
+        waiter = self._waiters.get(field)
+        if waiter is None and self._state.get(field) == value:
+            # Nothing will change on the device, so there is nothing to wait for
+            future.set_result(None)
+            return future
+        if waiter is None:
+            waiter = self._waiters[field] = [value, time.monotonic(), []]
+        elif waiter[0] != value:
+            # Earlier writes to the field are superseded and complete with this one
+            waiter[0] = value
+            waiter[1] = time.monotonic()
+        waiter[2].append(future)
+        return future
+
+    def _forget(self, futures: set[asyncio.Future]) -> None:
+        """Stop tracking acknowledgement futures nobody is waiting on anymore."""
+        for field, waiter in list(self._waiters.items()):
+            waiter[2] = [x for x in waiter[2] if x not in futures]
+            if not waiter[2]:
+                del self._waiters[field]
 
     def _handle_message(self, message):
         """Process a message from the websocket."""
-        try:
-            self._handle_json_message(json.loads(message))
-        except JSONDecodeError:
+        kind = classify(message)
+        if kind is FrameKind.CONTROL:
             self._handle_control_message(message)
+            return
+        err_msg = "Received unexpected JSON message (%s) - %s"
+        decoded = decode_state(message) if kind is FrameKind.STATE else None
+        if decoded is None:
+            self._logger.warning(err_msg, "NOT_AN_OBJECT", message)
+            return
+        values, rejected = decoded
+        if rejected and self._logger.isEnabledFor(logging.WARNING):
+            self._logger.warning(err_msg, "UNKNOWN_SCHEMA", json.dumps(rejected))
+        if values:
+            self._handle_json_message(values)
+
+    def _handle_pong(self) -> None:
+        """Record the round trip time of an acknowledged ping."""
+        if self._ping_sent is None:
+            self._logger.debug('Ping acknowledged')
+            return
+        rtt = time.monotonic() - self._ping_sent
+        if self._pings_outstanding == 1:
+            self._rtts.append(rtt)
+            self._metrics.rtt.observe(rtt)
+        self._logger.debug('Ping acknowledged after %.3f seconds', rtt)
+        self._missed_pongs = 0
+        self._ping_sent = None
+        self._pings_outstanding = 0
+
+    def _next_ping_interval(self) -> float:
+        """Adapt the ping interval to the health and activity of the connection."""
+        if self._ping_sent is not None or self.rtt_degraded:
+            self._ping_interval = KEEPALIVE_MIN_INTERVAL
+        elif time.monotonic() - self._last_frame < self._ping_interval:
+            # Recent state traffic already proves the connection is alive
+            self._ping_interval = min(self._ping_interval * 2, KEEPALIVE_MAX_INTERVAL)
+        else:
+            self._ping_interval = KEEPALIVE_INTERVAL
+        return self._ping_interval
+
+    def _notify(self, changes: Mapping[str, int | None]) -> None:
+        """Pass changed state to all registered callbacks."""
+        self._version += 1
+        started = time.perf_counter()
+        for callback in self._callbacks:
+            callback(changes)
+        self._metrics.callback_time.observe(time.perf_counter() - started)
+
+    def _update_state(self, changes: Mapping[str, int]) -> None:
+        """Apply state changes reported by the device."""
+        self._state.update(changes)
+        self._notify(changes)
 
     async def _keepalive(self):
-        """Send periodic messages to keep the websocket connection alive."""
+        """Send periodic pings and give up on the connection once the peer is dead."""
+        self._missed_pongs = 0
+        self._peer_dead = False
+        self._ping_interval = KEEPALIVE_INTERVAL
+        self._ping_sent = None
+        self._pings_outstanding = 0
         while True:
-            try:
-                await asyncio.sleep(5)
-                await self._send(ApiControl.PING)
-            except asyncio.CancelledError:
-                break
-            except Exception: # pylint: disable=broad-exception-caught
-                self._exception('Unexpected error during ping')
-                await asyncio.sleep(1)
+            await asyncio.sleep(self._next_ping_interval())
+            if self._ping_sent is not None and self._last_recv < self._ping_sent:
+                self._missed_pongs += 1
+                if self._missed_pongs >= KEEPALIVE_MISSED_PONGS:
+                    msg = 'No response to %s consecutive pings, closing connection'
+                    self._logger.warning(msg, self._missed_pongs)
+                    self._peer_dead = True
+                    return
+            elif self._ping_sent is not None:
+                self._missed_pongs = 0
+            self._ping_sent = time.monotonic()
+            self._pings_outstanding += 1
+            await self._send(ApiControl.PING)
 
     async def _listener(self):
-        """Handle receiving messages in a connection safe way."""
-        while True:
+        """Handle receiving messages until the connection is closed."""
+        async for message in self._ws:
+            self._last_recv = time.monotonic()
+            self._received(message)
             try:
-                async for message in self._ws:
-                    self._debug('RECV: %s', message)
-                    self._handle_message(message)
-            except asyncio.CancelledError:
-                break
+                self._handle_message(message)
             except Exception: # pylint: disable=broad-exception-caught
-                self._exception('Unexpected error during receive')
-                await asyncio.sleep(1)
+                self._logger.exception('Unexpected error while processing message')
+
+    def _received(self, message) -> None:
+        """Account for a message received from the fireplace websocket."""
+        self._metrics.frames_received += 1
+        self._metrics.bytes_received += len(message)
+        self._wire.debug('RECV: %s', message)
+        if self._recorder is not None:
+            self._recorder.record(RECORD_RECV, message)
 
     async def _send(self, message) -> None:
         """Send message to the fireplace websocket."""
-        self._debug("SEND: %s", message)
+        self._wire.debug("SEND: %s", message)
+        if self._recorder is not None:
+            self._recorder.record(RECORD_SEND, message)
         await self._ws.send(message)
+        self._metrics.frames_sent += 1
+        self._metrics.bytes_sent += len(message)
+
+    async def async_set_state(self, field: str, value: int, timeout: float = DEFAULT_ACK_TIMEOUT) -> None:
+        """Send a state update and wait until the fireplace confirms it."""
+        async with self.confirm(timeout):
+            self.set_state(field, value)
+
+    async def _expire_stale(self) -> None:
+        """Stop showing restored state if the fireplace does not report in time."""
+        try:
+            await self.wait_for_snapshot(STALE_TIMEOUT)
+        except TimeoutError:
+            self._logger.warning('No state received, restored state is no longer shown')
+            self._stale_expired = True
+            for callback in self._connection_callbacks:
+                callback(self._connection_state)
 
     async def close(self) -> None:
         """Close the websocket connection."""
-        self._debug('Connection closing')
+        self._logger.debug('Connection closing')
+        self._shutdown = True
+        if self._stale_expiry:
+            self._stale_expiry.cancel()
+            self._stale_expiry = None
         if self._connection:
             self._connection.cancel()
             await asyncio.gather(self._connection, return_exceptions=True)
             self._connection = None
-        if self._ws is not None:
-            await self._ws.close()
-            self._ws = None
-        self._debug('Connection closed')
+        await self._disconnect()
+        self._logger.debug('Connection closed')
+
+    @asynccontextmanager
+    async def confirm(self, timeout: float = DEFAULT_ACK_TIMEOUT) -> AsyncIterator[None]:
+        """Wait for every write made inside the block to be echoed by the fireplace.
+
+        Raises TimeoutError if any of the writes is not confirmed in time.
+        """
+        futures = []
+        token = _ACK_SCOPE.set(futures)
+        try:
+            yield
+        finally:
+            _ACK_SCOPE.reset(token)
+        if not futures:
+            return
+        _, pending = await asyncio.wait(futures, timeout=timeout)
+        if pending:
+            self._forget(pending)
+            raise TimeoutError(f"{self._host} did not confirm {len(pending)} write(s)")
 
     def get_state(self, field: str) -> int | None:
         """Query the state of the fireplace."""
@@ -178,41 +607,110 @@ class ProflameClientBase:
 
     async def open(self) -> None:
         """Connect to the Proflame websocket."""
-        self._debug('Connection opening')
+        self._logger.debug('Connection opening')
+        self._shutdown = False
         self._connection = asyncio.create_task(self._connect())
+        if self.stale and not self._stale_expired:
+            self._stale_expiry = asyncio.create_task(self._expire_stale())
 
-    def register_callback(self, callback) -> None:
-        """Register a callback that will be triggered on state changes."""
+    def register_batch_callback(
+        self, callback: Callable[[Mapping[str, int]], None]
+    ) -> Callable[[], None]:
+        """Register a callback triggered once per frame with all changed state."""
         self._callbacks.append(callback)
+        return lambda: self._callbacks.remove(callback)
+
+    def register_connection_callback(
+        self, callback: Callable[[ConnectionState], None]
+    ) -> Callable[[], None]:
+        """Register a callback that will be triggered on connection state changes."""
+        self._connection_callbacks.append(callback)
+        return lambda: self._connection_callbacks.remove(callback)
+
+    def register_callback(self, callback: Callable[[str, int], None]) -> Callable[[], None]:
+        """Register a callback that will be triggered for each changed key."""
+        def adapter(changes: Mapping[str, int]) -> None:
+            for key, value in changes.items():
+                callback(key, value)
+        return self.register_batch_callback(adapter)
+
+    def restore(self, state: Mapping[str, int]) -> None:
+        """Seed the client with previously known state until live state arrives."""
+        if self.has_snapshot:
+            return
+        self._state.update(state)
+        self._restored = True
+        self._version += 1
+
+    def _queue_write(self, writes: Mapping[str, int]) -> None:
+        """Queue writes that must reach the fireplace together."""
+        self._outbox.put(writes)
+        scope = _ACK_SCOPE.get()
+        if scope is not None:
+            scope.extend(self._expect(field, value) for field, value in writes.items())
 
     def set_state(self, field: str, value: int) -> None:
         """Send a state update to the fireplace."""
-        self._queue.put_nowait({field: value})
-
-    def _debug(self, msg, *args) -> None:
-        """Shortcut for debug logging."""
-        formatted = f"PF[{self._host}] {msg}"
-        self._logger.debug(formatted, *args)
+        if self._transaction is not None:
+            # Re-insert so the frame carries fields in the order they were last written
+            self._transaction.pop(field, None)
+            self._transaction[field] = value
+            return
+        self._queue_write({field: value})
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """Stage every write made inside the block and send them together.
+
+        Writes are merged last-write-wins per field and queued as a single
+        command, which is never split, so they reach the fireplace in a single
+        ordered frame. Nothing is sent if the
+        block raises. A transaction opened inside another one joins it.
+        """
+        if self._transaction is not None:
+            yield
+            return
+        self._transaction = writes = {}
+        try:
+            yield
+        except BaseException:
+            self._transaction = None
+            self._discard(writes)
+            raise
+        self._transaction = None
+        if writes:
+            self._queue_write(writes)
+
+    async def wait_for_snapshot(self, timeout: float = SNAPSHOT_TIMEOUT) -> None:
+        """Wait until the first state report has been received from the fireplace.
+
+        The timeout starts once the client gets its first turn to connect, so
+        time spent queued behind other fireplaces does not count against it.
+        Raises TimeoutError if no state is received in time.
+        """
+        await self._dialing.wait()
+        async with asyncio.timeout(timeout):
+            await self._snapshot.wait()
 
-    def _error(self, msg, *args) -> None:
-        """Shortcut for error logging."""
-        formatted = f"PF[{self._host}] {msg}"
-        self._logger.error(formatted, *args)
+    @property
+    def ack_latency(self) -> float | None:
+        """Retrieve the rolling average time for writes to be confirmed in seconds."""
+        return fmean(self._ack_latencies) if self._ack_latencies else None
 
-    def _exception(self, msg, *args) -> None:
-        """Shortcut for exception logging."""
-        formatted = f"PF[{self._host}] {msg}"
-        self._logger.exception(formatted, *args)
+    @property
+    def available(self) -> bool:
+        """Return true if the connection is ready or restored state is recent enough to show."""
+        return self.connected or (self.stale and not self._stale_expired)
 
-    def _info(self, msg, *args) -> None:
-        """Shortcut for info logging."""
-        formatted = f"PF[{self._host}] {msg}"
-        self._logger.info(formatted, *args)
+    @property
+    def connected(self) -> bool:
+        """Return true if the connection is ready to exchange state."""
+        return self._connection_state == ConnectionState.READY
 
-    def _warning(self, msg, *args) -> None:
-        """Shortcut for warning logging."""
-        formatted = f"PF[{self._host}] {msg}"
-        self._logger.warning(formatted, *args)
+    @property
+    def connection_state(self) -> ConnectionState:
+        """Retrieve the current state of the connection."""
+        return self._connection_state
 
     @property
     def device_id(self) -> str:
@@ -220,9 +718,69 @@ class ProflameClientBase:
         return self._device_id
 
     @property
-    def full_state(self) -> dict[str, int]:
-        """Retrieve full copy of all know fireplace state."""
-        return {**self._state}
+    def dispatch_stats(self) -> dict[str, int | float]:
+        """Retrieve statistics about how effectively writes are coalesced and delivered."""
+        return {
+            'flushes': self._flushes,
+            'frames': self._frames_sent,
+            'last_flush_frames': self._last_flush_frames,
+            'merge_ratio': self._writes_sent / self._frames_sent if self._frames_sent else 1.0,
+            'writes': self._writes_sent,
+            **self._outbox.stats,
+        }
+
+    @property
+    def full_state(self) -> ProflameStateSnapshot:
+        """Retrieve immutable snapshot of all known fireplace state."""
+        return self._state.snapshot()
+
+    @property
+    def has_snapshot(self) -> bool:
+        """Return true once state has been received from the fireplace."""
+        return self._snapshot.is_set()
+
+    @property
+    def metrics(self) -> ProflameMetrics:
+        """Retrieve the runtime metrics of the connection."""
+        return self._metrics
+
+    @property
+    def rtt(self) -> float | None:
+        """Retrieve the rolling average ping round trip time in seconds."""
+        return fmean(self._rtts) if self._rtts else None
+
+    @property
+    def rtt_degraded(self) -> bool:
+        """Return true if the latest round trip time is notably worse than usual."""
+        if not self._rtts:
+            return False
+        return self._rtts[-1] > max(KEEPALIVE_RTT_THRESHOLD, 2 * self.rtt)
+
+    @property
+    def rtt_stats(self) -> dict[str, float | int | None]:
+        """Retrieve rolling statistics for the ping round trip time."""
+        return {
+            'average': self.rtt,
+            'last': self._rtts[-1] if self._rtts else None,
+            'max': max(self._rtts, default=None),
+            'min': min(self._rtts, default=None),
+            'samples': len(self._rtts),
+        }
+
+    @property
+    def state_version(self) -> int:
+        """Retrieve a counter that increases whenever the visible state changes."""
+        return self._version
+
+    @property
+    def stale(self) -> bool:
+        """Return true while state restored from a cache has not been refreshed."""
+        return self._restored and not self.has_snapshot
+
+    @property
+    def suppressed_updates(self) -> int:
+        """Retrieve the number of received values that matched known state."""
+        return self._suppressed_updates
 
     @property
     def uri(self):
@@ -19,6 +19,7 @@ from .const import (
     MAX_TEMPERATURE,
     MIN_TEMPERATURE,
     PROFLAME_COORDINATOR,
+    ApiAttrs,
     Preset,
 )
 from .coordinator import ProflameDataCoordinator
@@ -54,6 +55,13 @@ class ProflameClimate(ProflameEntity, ClimateEntity):
         ClimateEntityFeature.TARGET_TEMPERATURE
     )
     _attr_target_temperature_step = 1.0
+    _dependencies = frozenset({
+        ApiAttrs.CURRENT_TEMPERATURE,
+        ApiAttrs.FLAME_HEIGHT,
+        ApiAttrs.OPERATING_MODE,
+        ApiAttrs.TARGET_TEMPERATURE,
+        ApiAttrs.TEMPERATURE_UNIT,
+    })
 
     def __init__(self, coordinator: ProflameDataCoordinator) -> None:
         """Create new instance of the ProflameFlame class."""
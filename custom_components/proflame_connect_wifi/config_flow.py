@@ -1,6 +1,5 @@
 """Config flow for Proflame."""
 import logging
-import socket
 from typing import Any
 
 import voluptuous as vol
@@ -14,12 +13,36 @@ from homeassistant.const import (
     CONF_PORT,
     CONF_UNIQUE_ID,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.helpers.device_registry import format_mac
 
 from .client import ProflameClient
-from .const import DEFAULT_DEVICE, DEFAULT_NAME, DEFAULT_PORT, DOMAIN
+from .const import (
+    CONF_COALESCE_WINDOW,
+    CONF_COMMAND_TIMEOUT,
+    CONF_DEADBAND,
+    CONF_DEADBAND_PERCENT,
+    CONF_MAX_AGE,
+    CONF_MIN_INTERVAL,
+    CONF_OPTIMISTIC_TIMEOUT,
+    CONF_OUTBOX_POLICY,
+    CONF_RECORD,
+    CONF_SENSOR,
+    DEFAULT_COALESCE_WINDOW,
+    DEFAULT_COMMAND_TIMEOUT,
+    DEFAULT_DEVICE,
+    DEFAULT_NAME,
+    DEFAULT_OPTIMISTIC_TIMEOUT,
+    DEFAULT_PORT,
+    DOMAIN,
+    PROFLAME_RESOLVER,
+    PROFLAME_SUPERVISOR,
+    SENSOR_FILTER_DEFAULTS,
+    OutboxPolicy,
+)
+from .resolver import ProflameResolver
+from .supervisor import ProflameSupervisor
 
 DISCOVERY_CONFIRM_SCHEMA = vol.Schema({
     vol.Required(CONF_NAME, default=DEFAULT_NAME): str,
@@ -38,35 +61,41 @@ def build_user_schema(user_input: dict[str, Any] | None = None):
         vol.Required(CONF_UNIQUE_ID, default=state.get(CONF_UNIQUE_ID, None)): str,
     })
 
-def resolve_host(ip) -> str:
-    """Try to get a DNS name from an IP address with verification of forward resolution."""
-    try:
-        host = socket.getnameinfo((ip, 0), 0)[0]
-        resolved = [x[4][0] for x in socket.getaddrinfo(
-            host=host,
-            port=None,
-            proto=6,
-        )]
-        return host if ip in resolved else ip
-    except socket.gaierror:
-        # Host from rDNS isn't forward resolvable
-        return ip
-
-def resolve_ip(host) -> str:
-    """Do DNS resolution for a host to store the IP and prevent duplicate entries."""
-    return [x[4][0] for x in socket.getaddrinfo(
-        host=host,
-        port=None,
-        proto=6,
-    )][0]
-
-async def test_connectivity(host: str, port: int = DEFAULT_PORT) -> bool:
+def build_sensor_schema(options: dict[str, Any]):
+    """Generate sensor filter schema from the current filter options."""
+    return vol.Schema({
+        vol.Required(CONF_DEADBAND, default=options[CONF_DEADBAND]): vol.All(
+            vol.Coerce(float), vol.Range(min=0)
+        ),
+        vol.Required(CONF_DEADBAND_PERCENT, default=options[CONF_DEADBAND_PERCENT]): bool,
+        vol.Required(CONF_MIN_INTERVAL, default=options[CONF_MIN_INTERVAL]): vol.All(
+            vol.Coerce(int), vol.Range(min=0)
+        ),
+        vol.Required(CONF_MAX_AGE, default=options[CONF_MAX_AGE]): vol.All(
+            vol.Coerce(int), vol.Range(min=0)
+        ),
+    })
+
+def get_resolver(hass: HomeAssistant) -> ProflameResolver:
+    """Retrieve the resolver shared by all flows."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if PROFLAME_RESOLVER not in domain_data:
+        domain_data[PROFLAME_RESOLVER] = ProflameResolver()
+    return domain_data[PROFLAME_RESOLVER]
+
+async def test_connectivity(host: str, port: int = DEFAULT_PORT, handoff: bool = False) -> bool:
     """Validate fireplace is connectable."""
-    return await ProflameClient.test_connection(host, port)
+    return await ProflameClient.test_connection(host, port, handoff)
 
 async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> bool:
-    """Validate user input."""
-    return await test_connectivity(data[CONF_HOST], data[CONF_PORT],)
+    """Validate user input and keep the connection warm for the new entry."""
+    # A fireplace that is already connected is not dialed a second time
+    supervisor: ProflameSupervisor | None = hass.data.get(DOMAIN, {}).get(PROFLAME_SUPERVISOR)
+    if supervisor is not None:
+        client = supervisor.find_client(data[CONF_HOST], data[CONF_PORT])
+        if client is not None and client.connected:
+            return True
+    return await test_connectivity(data[CONF_HOST], data[CONF_PORT], handoff=True)
 
 
 class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
@@ -75,6 +104,14 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     VERSION = 1
     MINOR_VERSION = 0
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> config_entries.OptionsFlow:
+        """Create the options flow."""
+        return OptionsFlowHandler(config_entry)
+
     @property
     def _device(self):
         host = self.context.get(CONF_HOST, None)
@@ -126,12 +163,22 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 errors={CONF_HOST: 'cannot_connect'}
             )
 
+        try:
+            ip = await get_resolver(self.hass).resolve_ip(user_input[CONF_HOST])
+        except (OSError, TimeoutError):
+            _LOGGER.error('Unable to resolve Proflame fireplace: %s', user_input[CONF_HOST])
+            return self.async_show_form(
+                step_id='user',
+                data_schema=build_user_schema(user_input),
+                errors={CONF_HOST: 'cannot_connect'}
+            )
+
         await self._async_set_unique_id(user_input[CONF_UNIQUE_ID])
         return self.async_create_entry(
             data={
                 CONF_NAME: user_input[CONF_NAME],
                 CONF_HOST: user_input[CONF_HOST],
-                CONF_IP_ADDRESS: resolve_ip(user_input[CONF_HOST]),
+                CONF_IP_ADDRESS: ip,
                 CONF_PORT: user_input[CONF_PORT],
                 CONF_UNIQUE_ID: self.unique_id
             },
@@ -144,7 +191,7 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         """Handle configuration via the UI."""
         await self._async_set_unique_id(format_mac(discovery_info.macaddress))
 
-        self.context[CONF_HOST] = resolve_host(discovery_info.ip)
+        self.context[CONF_HOST] = await get_resolver(self.hass).resolve_host(discovery_info.ip)
         self.context[CONF_IP_ADDRESS] = discovery_info.ip
         in_flight = [x['context'][CONF_IP_ADDRESS] for x in self._async_in_progress()]
         if discovery_info.ip in in_flight:
@@ -173,3 +220,116 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             errors={},
             step_id='discovery_confirm'
         )
+
+
+class OptionsFlowHandler(config_entries.OptionsFlow):
+    """Handle command delivery, sensor publishing filters and frame recording."""
+
+    def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
+        """Create new instance of the OptionsFlowHandler class."""
+        self.config_entry = config_entry
+        self._sensor = None
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Select the options to configure."""
+        return self.async_show_menu(
+            menu_options=['commands', 'filters', 'recorder'],
+            step_id='init'
+        )
+
+    async def async_step_commands(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Configure how long commands may wait to be sent to the fireplace."""
+        if user_input is not None:
+            return self.async_create_entry(
+                data={
+                    **self.config_entry.options,
+                    **user_input,
+                },
+                title='',
+            )
+
+        options = self.config_entry.options
+        return self.async_show_form(
+            data_schema=vol.Schema({
+                vol.Required(
+                    CONF_COMMAND_TIMEOUT,
+                    default=options.get(CONF_COMMAND_TIMEOUT, DEFAULT_COMMAND_TIMEOUT),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+                vol.Required(
+                    CONF_OUTBOX_POLICY,
+                    default=options.get(CONF_OUTBOX_POLICY, OutboxPolicy.EXPIRE),
+                ): vol.In([x.value for x in OutboxPolicy]),
+                vol.Required(
+                    CONF_COALESCE_WINDOW,
+                    default=options.get(CONF_COALESCE_WINDOW, DEFAULT_COALESCE_WINDOW),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0, max=1)),
+                vol.Required(
+                    CONF_OPTIMISTIC_TIMEOUT,
+                    default=options.get(CONF_OPTIMISTIC_TIMEOUT, DEFAULT_OPTIMISTIC_TIMEOUT),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+            }),
+            step_id='commands'
+        )
+
+    async def async_step_filters(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Select the sensor to configure."""
+        if user_input is not None:
+            self._sensor = user_input[CONF_SENSOR]
+            return await self.async_step_sensor()
+
+        return self.async_show_form(
+            data_schema=vol.Schema({
+                vol.Required(CONF_SENSOR): vol.In([str(x) for x in SENSOR_FILTER_DEFAULTS]),
+            }),
+            step_id='filters'
+        )
+
+    async def async_step_recorder(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Enable or disable recording of all frames exchanged with the fireplace."""
+        if user_input is not None:
+            return self.async_create_entry(
+                data={
+                    **self.config_entry.options,
+                    CONF_RECORD: user_input[CONF_RECORD],
+                },
+                title='',
+            )
+
+        record = self.config_entry.options.get(CONF_RECORD, False)
+        return self.async_show_form(
+            data_schema=vol.Schema({
+                vol.Required(CONF_RECORD, default=record): bool,
+            }),
+            step_id='recorder'
+        )
+
+    async def async_step_sensor(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Configure the publishing filters of a single sensor."""
+        if user_input is not None:
+            return self.async_create_entry(
+                data={
+                    **self.config_entry.options,
+                    self._sensor: user_input,
+                },
+                title='',
+            )
+
+        options = {
+            **SENSOR_FILTER_DEFAULTS[self._sensor],
+            **self.config_entry.options.get(self._sensor, {}),
+        }
+        return self.async_show_form(
+            data_schema=build_sensor_schema(options),
+            description_placeholders={CONF_SENSOR: self._sensor},
+            step_id='sensor'
+        )
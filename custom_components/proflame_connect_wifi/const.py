@@ -34,6 +34,16 @@ class ApiControl(StrEnum):
     PONG = "PROFLAMEPONG"
 
 
+class ConnectionState(StrEnum):
+    """Lifecycle states of the connection to a fireplace."""
+
+    CONNECTING = "connecting"
+    HANDSHAKING = "handshaking"
+    READY = "ready"
+    BACKOFF = "backoff"
+    CLOSED = "closed"
+
+
 class OperatingMode(IntEnum):
     """Available operating modes for fireplace unit."""
 
@@ -43,6 +53,13 @@ class OperatingMode(IntEnum):
     SMART = 3
 
 
+class OutboxPolicy(StrEnum):
+    """Handling of commands queued while a fireplace is disconnected."""
+
+    EXPIRE = "expire"
+    KEEP = "keep"
+
+
 class PilotMode(IntEnum):
     """Available pilot modes for the fireplace."""
 
@@ -65,14 +82,118 @@ DEFAULT_DEVICE = 'Proflame Fireplace'
 DEFAULT_NAME = 'Fireplace'
 DEFAULT_PORT = 88
 
+ACK_LATENCY_SAMPLES = 20
+METRIC_SAMPLES = 50
+
+# Upper bounds of histogram buckets, in seconds for timings
+DEPTH_BUCKETS = (1, 2, 4, 8, 16, 32)
+TIMING_BUCKETS = (0.0001, 0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+DEFAULT_ACK_TIMEOUT = 5
+DEFAULT_COALESCE_WINDOW = 0.05
+DEFAULT_COMMAND_TIMEOUT = 30
+DEFAULT_OPTIMISTIC_TIMEOUT = 5
+
+BACKOFF_INITIAL = 1
+BACKOFF_MAX = 60
+BACKOFF_STABLE_TIME = 30
+HANDSHAKE_TIMEOUT = 10
+SNAPSHOT_TIMEOUT = 15
+STALE_TIMEOUT = 15
+WARM_CONNECTION_TTL = 10
+
+OUTBOX_MAX_ATTEMPTS = 3
+OUTBOX_MAX_SIZE = 32
+
+DNS_NEGATIVE_TTL = 60
+DNS_POSITIVE_TTL = 300
+DNS_TIMEOUT = 5
+
+MAX_CONCURRENT_CONNECTS = 4
+CONNECT_STAGGER = 0.25
+
+KEEPALIVE_INTERVAL = 5
+KEEPALIVE_MAX_INTERVAL = 30
+KEEPALIVE_MIN_INTERVAL = 2
+KEEPALIVE_MISSED_PONGS = 3
+KEEPALIVE_RTT_SAMPLES = 20
+KEEPALIVE_RTT_THRESHOLD = 0.5
+
+ATTR_FAN_SPEED = "fan_speed"
+ATTR_FLAME_HEIGHT = "flame_height"
+ATTR_LIGHT_BRIGHTNESS = "light_brightness"
+ATTR_PILOT_MODE = "pilot_mode"
+ATTR_PRESET = "preset"
+ATTR_TARGET_TEMPERATURE = "target_temperature"
+
+SERVICE_SET_STATE = "set_state"
+
+CONF_COALESCE_WINDOW = "coalesce_window"
+CONF_COMMAND_TIMEOUT = "command_timeout"
+CONF_DEADBAND = "deadband"
+CONF_DEADBAND_PERCENT = "deadband_percent"
+CONF_MAX_AGE = "max_age"
+CONF_MIN_INTERVAL = "min_interval"
+CONF_OPTIMISTIC_TIMEOUT = "optimistic_timeout"
+CONF_OUTBOX_POLICY = "outbox_policy"
+CONF_RECORD = "record"
+CONF_SENSOR = "sensor"
+
+PROFLAME_CACHE = "cache"
 PROFLAME_CLIENT = "client"
 PROFLAME_COORDINATOR = "coordinator"
+PROFLAME_RESOLVER = "resolver"
+PROFLAME_SUPERVISOR = "supervisor"
+
+# Fields whose relative order within a frame is significant to the device
+ORDER_SENSITIVE_ATTRS = [
+    ApiAttrs.FLAME_HEIGHT,
+    ApiAttrs.OPERATING_MODE,
+]
 
 ADJUSTABLE_MODES = [
     OperatingMode.MANUAL,
     OperatingMode.THERMOSTAT,
 ]
 
+RECORD_RECV = "<"
+RECORD_SEND = ">"
+RECORDER_BACKUP_COUNT = 3
+RECORDER_MAX_BYTES = 1048576
+
+CACHE_SAVE_DELAY = 30
+CACHE_STORAGE_KEY = f"{DOMAIN}.state"
+CACHE_STORAGE_VERSION = 1
+
+# Diagnostic values that change constantly and are not worth a cache write
+VOLATILE_ATTRS = [
+    ApiAttrs.FREE_HEAP,
+    ApiAttrs.MIN_FREE_HEAP,
+    ApiAttrs.WIFI_SIGNAL_STR,
+]
+
+# Publishing filters applied to diagnostic sensors unless overridden in options
+SENSOR_FILTER_DEFAULTS = {
+    ApiAttrs.FREE_HEAP: {
+        CONF_DEADBAND: 2,
+        CONF_DEADBAND_PERCENT: True,
+        CONF_MAX_AGE: 900,
+        CONF_MIN_INTERVAL: 60,
+    },
+    ApiAttrs.MIN_FREE_HEAP: {
+        CONF_DEADBAND: 0,
+        CONF_DEADBAND_PERCENT: False,
+        CONF_MAX_AGE: 3600,
+        CONF_MIN_INTERVAL: 60,
+    },
+    ApiAttrs.WIFI_SIGNAL_STR: {
+        CONF_DEADBAND: 3,
+        CONF_DEADBAND_PERCENT: False,
+        CONF_MAX_AGE: 900,
+        CONF_MIN_INTERVAL: 30,
+    },
+}
+
 MAX_FAN_SPEED = 6
 MIN_FAN_SPEED = 0
 
@@ -1,13 +1,14 @@
 """Data coordinators for proflame integration."""
+from collections.abc import Mapping
 import logging
 import re
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
 from .client import ProflameClient
-from .const import DOMAIN
+from .const import DOMAIN, ConnectionState
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -15,7 +16,13 @@ _LOGGER = logging.getLogger(__name__)
 class ProflameDataCoordinator(DataUpdateCoordinator):
     """Base class for device coordinators."""
 
-    def __init__(self, hass: HomeAssistant, client: ProflameClient, name: str) -> None:
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        client: ProflameClient,
+        name: str,
+        device_id: str | None = None,
+    ) -> None:
         """Initialize the Proflam coordinator class."""
         super().__init__(
             hass=hass,
@@ -23,22 +30,48 @@ class ProflameDataCoordinator(DataUpdateCoordinator):
             logger=_LOGGER,
         )
         self.client = client
+        self._changes: Mapping[str, int] | None = None
         self.async_set_updated_data(self.client.full_state)
-        self.client.register_callback(self.handle_state_change)
+        self._remove_callbacks = [
+            self.client.register_batch_callback(self.handle_state_change),
+            self.client.register_connection_callback(self.handle_connection_change),
+        ]
+        self.device_id = device_id or client.device_id
         self.device_name = name
-        self.unique_id = re.sub('[^A-Za-z0-9]+', '', client.device_id)
+        self.unique_id = re.sub('[^A-Za-z0-9]+', '', self.device_id)
         self.device_info = DeviceInfo(
-            identifiers={(DOMAIN, self.client.device_id)},
+            identifiers={(DOMAIN, self.device_id)},
             manufacturer='Sit Group',
             model='Generic',
             name=self.device_name
         )
 
-    def handle_state_change(self, key: str, value: int) -> None:
-        """Pass new data to the underlying coordinator."""
-        self.async_set_updated_data(
-            data={
-                **self.data,
-                key: value,
-            }
-        )
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update listeners whose dependencies were changed by the last frame.
+
+        Listeners registered without a context, and every listener after a
+        connection change, are always updated.
+        """
+        changes, self._changes = self._changes, None
+        if changes is None:
+            super().async_update_listeners()
+            return
+        for update_callback, dependencies in list(self._listeners.values()):
+            if dependencies is None or not dependencies.isdisjoint(changes):
+                update_callback()
+
+    async def async_shutdown(self) -> None:
+        """Stop following the client, which may outlive the coordinator when shared."""
+        while self._remove_callbacks:
+            self._remove_callbacks.pop()()
+        await super().async_shutdown()
+
+    def handle_connection_change(self, state: ConnectionState) -> None:
+        """Refresh entity availability when the connection state changes."""
+        self.async_update_listeners()
+
+    def handle_state_change(self, changes: Mapping[str, int]) -> None:
+        """Pass the state after a single frame to the underlying coordinator."""
+        self._changes = changes
+        self.async_set_updated_data(self.client.full_state)
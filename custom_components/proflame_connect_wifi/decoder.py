@@ -0,0 +1,105 @@
+"""Decoding of frames received from a Proflame fireplace."""
+from collections.abc import Callable
+from enum import Enum
+import json
+import re
+from typing import Any
+
+from .const import (
+    MAX_FAN_SPEED,
+    MAX_FLAME_HEIGHT,
+    MAX_LIGHT_BRIGHTNESS,
+    MIN_FAN_SPEED,
+    MIN_FLAME_HEIGHT,
+    MIN_LIGHT_BRIGHTNESS,
+    ApiAttrs,
+    OperatingMode,
+    PilotMode,
+)
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    loads = json.loads
+else:
+    loads = orjson.loads
+
+# Characters a JSON document that is not an object can start with
+_JSON_VALUE_START = frozenset('["-0123456789')
+_WHITESPACE = frozenset(' \t\r\n')
+_INTEGER = re.compile('-?[0-9]+')
+
+
+class FrameKind(Enum):
+    """Kinds of frames sent by the fireplace."""
+
+    CONTROL = 'control'
+    INVALID = 'invalid'
+    STATE = 'state'
+
+
+def _integer(value: Any) -> int | None:
+    """Convert a field value to an integer, or None if it is not one."""
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, str) and _INTEGER.fullmatch(value):
+        return int(value)
+    return None
+
+
+def _ranged(minimum: int, maximum: int) -> Callable[[Any], int | None]:
+    """Create a decoder for integers within an inclusive range."""
+    def decode(value: Any) -> int | None:
+        value = _integer(value)
+        if value is None or not minimum <= value <= maximum:
+            return None
+        return value
+    return decode
+
+
+FIELD_DECODERS: dict[str, Callable[[Any], int | None]] = {
+    ApiAttrs.FAN_SPEED: _ranged(MIN_FAN_SPEED, MAX_FAN_SPEED),
+    ApiAttrs.FLAME_HEIGHT: _ranged(MIN_FLAME_HEIGHT, MAX_FLAME_HEIGHT),
+    ApiAttrs.LIGHT_BRIGHTNESS: _ranged(MIN_LIGHT_BRIGHTNESS, MAX_LIGHT_BRIGHTNESS),
+    ApiAttrs.OPERATING_MODE: _ranged(min(OperatingMode), max(OperatingMode)),
+    ApiAttrs.PILOT_MODE: _ranged(min(PilotMode), max(PilotMode)),
+    ApiAttrs.TEMPERATURE_UNIT: _ranged(0, 1),
+}
+
+
+def classify(message: str) -> FrameKind:
+    """Classify a frame by its first character without parsing it."""
+    first = message[:1]
+    if first in _WHITESPACE:
+        first = message.lstrip()[:1]
+    if first == '{':
+        return FrameKind.STATE
+    if first in _JSON_VALUE_START:
+        return FrameKind.INVALID
+    return FrameKind.CONTROL
+
+
+def decode_state(message: str) -> tuple[dict[str, int], dict[str, Any]] | None:
+    """Decode a state frame into valid and rejected fields.
+
+    Returns None if the frame is not a JSON object.
+    """
+    try:
+        fields = loads(message)
+    except ValueError:
+        return None
+    if not isinstance(fields, dict):
+        return None
+    values = {}
+    rejected = {}
+    for key, value in fields.items():
+        decoded = FIELD_DECODERS.get(key, _integer)(value)
+        if decoded is None:
+            rejected[key] = value
+        else:
+            values[key] = decoded
+    return values, rejected
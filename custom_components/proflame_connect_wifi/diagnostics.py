@@ -0,0 +1,38 @@
+"""Diagnostics support for Proflame fireplaces."""
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_HOST, CONF_IP_ADDRESS, CONF_UNIQUE_ID
+from homeassistant.core import HomeAssistant
+
+from .client import ProflameClient
+from .const import DOMAIN, PROFLAME_CLIENT, PROFLAME_SUPERVISOR
+from .supervisor import ProflameSupervisor
+
+TO_REDACT = {CONF_HOST, CONF_IP_ADDRESS, CONF_UNIQUE_ID, 'unique_id'}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    client: ProflameClient = hass.data[DOMAIN][entry.entry_id][PROFLAME_CLIENT]
+    supervisor: ProflameSupervisor = hass.data[DOMAIN][PROFLAME_SUPERVISOR]
+    return {
+        'entry': async_redact_data(entry.as_dict(), TO_REDACT),
+        'connection': {
+            'ack_latency': client.ack_latency,
+            'connection_state': client.connection_state,
+            'dispatch_stats': client.dispatch_stats,
+            'rtt_degraded': client.rtt_degraded,
+            'rtt_stats': client.rtt_stats,
+            'stale': client.stale,
+            'suppressed_updates': client.suppressed_updates,
+        },
+        'fleet': supervisor.progress,
+        'metrics': client.metrics.as_dict(),
+        'state': dict(client.full_state),
+        'state_version': client.state_version,
+    }
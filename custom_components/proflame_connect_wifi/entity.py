@@ -1,5 +1,7 @@
 """Generic base class for Proflame entities."""
+from collections.abc import Iterable
 import logging
+from typing import Any
 
 from homeassistant.helpers.entity import EntityDescription
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
@@ -10,15 +12,25 @@ _LOGGER = logging.getLogger(__name__)
 
 
 class ProflameEntity(CoordinatorEntity):
-    """Generic base class for proflame entities."""
+    """Generic base class for proflame entities.
+
+    Entities only receive coordinator updates for frames that change one of
+    the attributes they depend on. Entities without dependencies receive
+    every update.
+    """
+
+    _dependencies: frozenset[str] | None = None
 
     def __init__(
         self,
         coordinator: ProflameDataCoordinator,
         description: EntityDescription,
+        dependencies: Iterable[str] | None = None,
     ) -> None:
         """Create new instance of the ProflamEntity class."""
-        super().__init__(coordinator)
+        if dependencies is not None:
+            self._dependencies = frozenset(dependencies)
+        super().__init__(coordinator, context=self._dependencies)
         self.entity_description = description
         self._device = coordinator.client
         self._attr_device_info = coordinator.device_info
@@ -26,3 +38,15 @@ class ProflameEntity(CoordinatorEntity):
         self._attr_should_poll = False
         self._attr_unique_id = f"{description.key}_{coordinator.unique_id}"
         self._logger = _LOGGER
+
+    @property
+    def available(self) -> bool:
+        """Return true if the fireplace is connected or recent restored state is shown."""
+        return super().available and self._device.available
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Mark state restored from the cache until the fireplace reports."""
+        if self._device.stale:
+            return {'stale': True}
+        return None
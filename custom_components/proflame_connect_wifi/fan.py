@@ -11,7 +11,7 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import DOMAIN, MAX_FAN_SPEED, PROFLAME_COORDINATOR
+from .const import DOMAIN, MAX_FAN_SPEED, PROFLAME_COORDINATOR, ApiAttrs
 from .coordinator import ProflameDataCoordinator
 from .entity import ProflameEntity
 
@@ -32,6 +32,10 @@ class ProflameFan(ProflameEntity, FanEntity):
 
     _attr_supported_features = FanEntityFeature.SET_SPEED
     _attr_speed_count = MAX_FAN_SPEED
+    _dependencies = frozenset({
+        ApiAttrs.FAN_SPEED,
+        ApiAttrs.OPERATING_MODE,
+    })
 
     def __init__(self, coordinator: ProflameDataCoordinator) -> None:
         """Create new instance of the ProflameLight class."""
@@ -58,7 +62,7 @@ class ProflameFan(ProflameEntity, FanEntity):
             return math.floor(self.fan_speed * (100 / MAX_FAN_SPEED))
         return 0
 
-    def set_percentage(self, percentage: int) -> None:
+    async def async_set_percentage(self, percentage: int) -> None:
         """Set the speed of the fireplace fan."""
         speed = math.ceil(percentage / (100 / MAX_FAN_SPEED))
         self._device.set_fan_speed(speed)
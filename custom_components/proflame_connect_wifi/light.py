@@ -11,7 +11,7 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import DOMAIN, MAX_LIGHT_BRIGHTNESS, PROFLAME_COORDINATOR
+from .const import DOMAIN, MAX_LIGHT_BRIGHTNESS, PROFLAME_COORDINATOR, ApiAttrs
 from .coordinator import ProflameDataCoordinator
 from .entity import ProflameEntity
 
@@ -32,6 +32,10 @@ class ProflameLight(ProflameEntity, LightEntity):
 
     _attr_color_mode = ColorMode.BRIGHTNESS
     _attr_supported_color_modes = {ColorMode.BRIGHTNESS}
+    _dependencies = frozenset({
+        ApiAttrs.LIGHT_BRIGHTNESS,
+        ApiAttrs.OPERATING_MODE,
+    })
 
     def __init__(self, coordinator: ProflameDataCoordinator) -> None:
         """Create new instance of the ProflameLight class."""
@@ -54,14 +58,15 @@ class ProflameLight(ProflameEntity, LightEntity):
         brightness = self.brightness
         return None if brightness is None else brightness
 
-    def turn_on(self, **kwargs: Any) -> None:
+    async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn the primary light on."""
         brightness = kwargs.get('brightness', None)
         if brightness is None:
             self._device.turn_on_light()
+            return
         converted = math.ceil(brightness / (255 / MAX_LIGHT_BRIGHTNESS))
         self._device.set_light_brightness(converted)
 
-    def turn_off(self, **kwargs: Any) -> None:
+    async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn the primary light off."""
         self._device.set_light_brightness(0)
@@ -0,0 +1,87 @@
+"""Runtime metrics collected by a Proflame client."""
+from bisect import bisect_left
+from collections import deque
+from statistics import fmean
+from typing import Any
+
+from .const import DEPTH_BUCKETS, METRIC_SAMPLES, TIMING_BUCKETS
+
+
+class ProflameHistogram:
+    """Distribution of observed values with fixed buckets and recent samples."""
+
+    __slots__ = ('_bounds', '_buckets', 'count', 'maximum', 'recent', 'total')
+
+    def __init__(self, bounds: tuple[float, ...] = TIMING_BUCKETS) -> None:
+        """Create new instance of the ProflameHistogram class."""
+        self._bounds = bounds
+        self._buckets = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.maximum = None
+        self.recent = deque(maxlen=METRIC_SAMPLES)
+        self.total = 0
+
+    def observe(self, value: float) -> None:
+        """Record a single observation."""
+        self._buckets[bisect_left(self._bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        self.recent.append(value)
+        if self.maximum is None or value > self.maximum:
+            self.maximum = value
+
+    def as_dict(self) -> dict[str, Any]:
+        """Represent the histogram as plain data."""
+        buckets = {f"le_{bound}": count for bound, count in zip(self._bounds, self._buckets)}
+        buckets['inf'] = self._buckets[-1]
+        return {
+            'buckets': buckets,
+            'count': self.count,
+            'max': self.maximum,
+            'mean': self.mean,
+            'recent': list(self.recent),
+            'recent_mean': self.recent_mean,
+        }
+
+    @property
+    def mean(self) -> float | None:
+        """Mean of all observations."""
+        return self.total / self.count if self.count else None
+
+    @property
+    def recent_mean(self) -> float | None:
+        """Mean of the most recent observations."""
+        return fmean(self.recent) if self.recent else None
+
+
+class ProflameMetrics:
+    """Counters and timings for a single fireplace connection."""
+
+    def __init__(self) -> None:
+        """Create new instance of the ProflameMetrics class."""
+        self.bytes_received = 0
+        self.bytes_sent = 0
+        self.frames_received = 0
+        self.frames_sent = 0
+        self.reconnects = 0
+
+        self.callback_time = ProflameHistogram()
+        self.handshake_time = ProflameHistogram()
+        self.queue_depth = ProflameHistogram(DEPTH_BUCKETS)
+        self.queue_wait = ProflameHistogram()
+        self.rtt = ProflameHistogram()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Represent all metrics as plain data."""
+        return {
+            'bytes_received': self.bytes_received,
+            'bytes_sent': self.bytes_sent,
+            'callback_time': self.callback_time.as_dict(),
+            'frames_received': self.frames_received,
+            'frames_sent': self.frames_sent,
+            'handshake_time': self.handshake_time.as_dict(),
+            'queue_depth': self.queue_depth.as_dict(),
+            'queue_wait': self.queue_wait.as_dict(),
+            'reconnects': self.reconnects,
+            'rtt': self.rtt.as_dict(),
+        }
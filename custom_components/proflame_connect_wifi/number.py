@@ -8,7 +8,7 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import DOMAIN, MAX_FLAME_HEIGHT, MIN_FLAME_HEIGHT, PROFLAME_COORDINATOR
+from .const import DOMAIN, MAX_FLAME_HEIGHT, MIN_FLAME_HEIGHT, PROFLAME_COORDINATOR, ApiAttrs
 from .coordinator import ProflameDataCoordinator
 from .entity import ProflameEntity
 
@@ -31,6 +31,10 @@ class ProflameFlame(ProflameEntity, NumberEntity):
     _attr_native_min_value: float = MIN_FLAME_HEIGHT
     _attr_native_step: float = 1
     _attr_mode: NumberMode = NumberMode.SLIDER
+    _dependencies = frozenset({
+        ApiAttrs.FLAME_HEIGHT,
+        ApiAttrs.OPERATING_MODE,
+    })
 
     def __init__(self, coordinator: ProflameDataCoordinator) -> None:
         """Create new instance of the ProflameFlame class."""
@@ -0,0 +1,184 @@
+"""Bounded queue of writes waiting to be sent to a Proflame fireplace."""
+import asyncio
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+import logging
+import time
+
+from .const import (
+    DEFAULT_COMMAND_TIMEOUT,
+    ORDER_SENSITIVE_ATTRS,
+    OUTBOX_MAX_ATTEMPTS,
+    OUTBOX_MAX_SIZE,
+    OutboxPolicy,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class ProflameCommand:
+    """Field writes requested by the user that must be sent together."""
+
+    data: dict[str, int]
+    queued: float
+    deadline: float
+
+
+@dataclass(slots=True)
+class ProflameFrame:
+    """A frame of merged writes waiting to be sent."""
+
+    data: dict[str, int]
+    deadline: float
+    attempts: int = 0
+
+
+class ProflameOutbox:
+    """Holds pending commands and the frames merged from them.
+
+    Commands that are no longer wanted are dropped instead of blocking the
+    writes queued behind them: a newer write to the same field replaces the
+    pending one, commands expire at their deadline, the oldest command is
+    dropped when the queue is full and a frame is dropped once it has failed
+    to send too many times. Writes dropped for any of these reasons are passed
+    to the drop callback. With the keep policy, commands do not expire while
+    disconnected; their deadlines restart once the connection is back.
+    """
+
+    def __init__(
+        self,
+        timeout: float = DEFAULT_COMMAND_TIMEOUT,
+        policy: OutboxPolicy = OutboxPolicy.EXPIRE,
+        max_size: int = OUTBOX_MAX_SIZE,
+        max_attempts: int = OUTBOX_MAX_ATTEMPTS,
+        logger: logging.Logger | logging.LoggerAdapter | None = None,
+        on_drop: Callable[[Mapping[str, int]], None] | None = None,
+    ) -> None:
+        """Create new instance of the ProflameOutbox class."""
+        self._commands: list[ProflameCommand] = []
+        self._frames: list[ProflameFrame] = []
+        self._logger = logger or _LOGGER
+        self._max_attempts = max_attempts
+        self._max_size = max_size
+        self._on_drop = on_drop
+        self._policy = policy
+        self._ready = asyncio.Event()
+        self._timeout = timeout
+
+        self.dropped = 0
+        self.expired = 0
+        self.superseded = 0
+
+    def __len__(self) -> int:
+        """Count the commands and frames waiting to be sent."""
+        return len(self._commands) + len(self._frames)
+
+    def _expire(self, now: float) -> None:
+        """Drop pending commands whose deadline has passed."""
+        live = [x for x in self._commands if x.deadline >= now]
+        expired = [x for x in self._commands if x.deadline < now]
+        if expired:
+            self.expired += len(expired)
+            self._logger.warning('Dropped %s expired command(s)', len(expired))
+            self._commands = live
+            for command in expired:
+                self._dropped(command.data)
+
+    def _supersede(self, field: str, value: int) -> bool:
+        """Replace the pending write of a field in place, if order allows it."""
+        for index in range(len(self._commands) - 1, -1, -1):
+            command = self._commands[index]
+            if field not in command.data:
+                continue
+            if len(command.data) > 1:
+                # Transactions are sent exactly as committed
+                return False
+            later = self._commands[index + 1:]
+            if field in ORDER_SENSITIVE_ATTRS and any(
+                y in ORDER_SENSITIVE_ATTRS for x in later for y in x.data
+            ):
+                return False
+            command.data[field] = value
+            command.deadline = time.monotonic() + self._timeout
+            self.superseded += 1
+            return True
+        return False
+
+    def _dropped(self, data: Mapping[str, int]) -> None:
+        """Report writes that will not be sent."""
+        if self._on_drop is not None:
+            self._on_drop(data)
+
+    def frame(self) -> ProflameFrame | None:
+        """Retrieve the next frame to send, dropping frames that are no longer wanted."""
+        now = time.monotonic()
+        while self._frames:
+            frame = self._frames[0]
+            if frame.deadline < now:
+                self.expired += len(frame.data)
+                self._logger.warning('Dropped expired frame %s', frame.data)
+            elif frame.attempts >= self._max_attempts:
+                self.dropped += len(frame.data)
+                self._logger.warning(
+                    'Dropped frame %s after %s failed attempts', frame.data, frame.attempts
+                )
+            else:
+                return frame
+            self._frames.pop(0)
+            self._dropped(frame.data)
+        return None
+
+    def pop_frame(self) -> None:
+        """Remove the frame that was just sent."""
+        self._frames.pop(0)
+
+    def push_frames(self, frames: list[dict[str, int]], deadline: float) -> None:
+        """Queue merged frames to be sent before any later commands."""
+        self._frames.extend(ProflameFrame(x, deadline) for x in frames)
+
+    def put(self, data: Mapping[str, int]) -> None:
+        """Queue writes that must be sent together."""
+        if len(data) == 1 and self._supersede(*next(iter(data.items()))):
+            return
+        if len(self._commands) >= self._max_size:
+            dropped = self._commands.pop(0)
+            self.dropped += 1
+            self._logger.warning(
+                'Outbox full, dropped command %s', dropped.data
+            )
+            self._dropped(dropped.data)
+        now = time.monotonic()
+        self._commands.append(ProflameCommand(dict(data), now, now + self._timeout))
+        self._ready.set()
+
+    def resume(self) -> None:
+        """Restart the deadlines of everything queued while disconnected."""
+        if self._policy != OutboxPolicy.KEEP:
+            return
+        deadline = time.monotonic() + self._timeout
+        for item in [*self._commands, *self._frames]:
+            item.deadline = deadline
+
+    def take(self) -> list[ProflameCommand]:
+        """Remove and return all pending commands that have not expired."""
+        self._expire(time.monotonic())
+        commands, self._commands = self._commands, []
+        self._ready.clear()
+        return commands
+
+    async def wait(self) -> None:
+        """Wait until at least one command is pending."""
+        while not self._commands:
+            self._ready.clear()
+            await self._ready.wait()
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Retrieve counters of commands that were not sent as requested."""
+        return {
+            'dropped': self.dropped,
+            'expired': self.expired,
+            'pending': len(self),
+            'superseded': self.superseded,
+        }
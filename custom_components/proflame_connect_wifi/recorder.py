@@ -0,0 +1,53 @@
+"""Recording of the frames exchanged with a Proflame fireplace.
+
+Recordings hold one JSON array per line with the monotonic time, direction
+and raw frame. They are written from a background thread so recording never
+blocks the event loop. See tools/replay.py for playing them back.
+"""
+import json
+import logging
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+import os
+import queue
+import time
+
+from .const import RECORDER_BACKUP_COUNT, RECORDER_MAX_BYTES
+
+class ProflameRecorder:
+    """Writes every frame sent to or received from a fireplace to a rotating file."""
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = RECORDER_MAX_BYTES,
+        backup_count: int = RECORDER_BACKUP_COUNT,
+    ) -> None:
+        """Create new instance of the ProflameRecorder class."""
+        self.path = path
+        handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backup_count, delay=True)
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        records = queue.SimpleQueue()
+        self._listener = QueueListener(records, handler)
+        self._listener.start()
+        # A logger outside of the hierarchy so frames never reach the log
+        self._logger = logging.Logger(__name__, logging.INFO)
+        self._logger.addHandler(QueueHandler(records))
+
+    @staticmethod
+    def open(path: str) -> 'ProflameRecorder':
+        """Create a recorder for a path, creating its directory if needed."""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        return ProflameRecorder(path)
+
+    def close(self) -> None:
+        """Flush pending frames and close the file."""
+        self._listener.stop()
+        for handler in self._listener.handlers:
+            handler.close()
+
+    def record(self, direction: str, message: str) -> None:
+        """Queue a single frame to be written."""
+        self._logger.info(
+            '%s',
+            json.dumps([round(time.monotonic(), 6), direction, message], separators=(',', ':')),
+        )
@@ -0,0 +1,97 @@
+"""Asynchronous DNS lookups for Proflame fireplaces."""
+import asyncio
+from collections.abc import Awaitable, Callable
+import logging
+import socket
+import time
+from typing import Any
+
+from .const import DNS_NEGATIVE_TTL, DNS_POSITIVE_TTL, DNS_TIMEOUT
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ProflameResolver:
+    """Resolves names off the event loop and caches the results.
+
+    Successful lookups are cached for the positive TTL and failures for the
+    shorter negative TTL. Concurrent lookups of the same name share a single
+    query, so a burst of discoveries for one device only resolves it once.
+    """
+
+    def __init__(
+        self,
+        positive_ttl: float = DNS_POSITIVE_TTL,
+        negative_ttl: float = DNS_NEGATIVE_TTL,
+        timeout: float = DNS_TIMEOUT,
+    ) -> None:
+        """Create new instance of the ProflameResolver class."""
+        self._cache: dict[tuple[str, str], tuple[float, Any, str | None]] = {}
+        self._inflight: dict[tuple[str, str], asyncio.Future] = {}
+        self._negative_ttl = negative_ttl
+        self._positive_ttl = positive_ttl
+        self._timeout = timeout
+
+    async def _lookup(self, key: tuple[str, str], query: Callable[[], Awaitable[Any]]) -> Any:
+        """Run a query unless a cached or running result is available."""
+        cached = self._cache.get(key)
+        if cached is not None and cached[0] > time.monotonic():
+            _, result, failure = cached
+            if failure is not None:
+                raise OSError(f"Lookup of {key[1]} failed ({failure})")
+            return result
+
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._query(key, query))
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        try:
+            return await asyncio.shield(future)
+        except (OSError, TimeoutError) as err:
+            # Every caller gets its own exception, even when sharing a query
+            raise OSError(f"Lookup of {key[1]} failed ({err!r})") from None
+
+    async def _query(self, key: tuple[str, str], query: Callable[[], Awaitable[Any]]) -> Any:
+        """Run a query and cache its outcome."""
+        now = time.monotonic()
+        self._cache = {k: v for k, v in self._cache.items() if v[0] > now}
+        try:
+            async with asyncio.timeout(self._timeout):
+                result = await query()
+        except (OSError, TimeoutError) as err:
+            _LOGGER.debug('Lookup of %s failed (%s)', key[1], repr(err))
+            self._cache[key] = (time.monotonic() + self._negative_ttl, None, repr(err))
+            raise
+        self._cache[key] = (time.monotonic() + self._positive_ttl, result, None)
+        return result
+
+    async def addresses(self, host: str) -> list[str]:
+        """Resolve a host name to its IP addresses."""
+        loop = asyncio.get_running_loop()
+
+        async def query() -> list[str]:
+            infos = await loop.getaddrinfo(host, None, proto=socket.IPPROTO_TCP)
+            return [x[4][0] for x in infos]
+        return await self._lookup(('addresses', host), query)
+
+    async def name(self, ip: str) -> str:
+        """Reverse resolve an IP address to a host name."""
+        loop = asyncio.get_running_loop()
+
+        async def query() -> str:
+            return (await loop.getnameinfo((ip, 0), 0))[0]
+        return await self._lookup(('name', ip), query)
+
+    async def resolve_host(self, ip: str) -> str:
+        """Try to get a DNS name from an IP address with verification of forward resolution."""
+        try:
+            host = await self.name(ip)
+            return host if ip in await self.addresses(host) else ip
+        except (OSError, TimeoutError):
+            # Host from rDNS isn't forward resolvable
+            return ip
+
+    async def resolve_ip(self, host: str) -> str:
+        """Do DNS resolution for a host to store the IP and prevent duplicate entries."""
+        return (await self.addresses(host))[0]
@@ -4,7 +4,7 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import DOMAIN, PROFLAME_COORDINATOR, PilotMode
+from .const import DOMAIN, PROFLAME_COORDINATOR, ApiAttrs, PilotMode
 from .coordinator import ProflameDataCoordinator
 from .entity import ProflameEntity
 
@@ -27,6 +27,9 @@ class ProflamePilot(ProflameEntity, SelectEntity):
         'Continuous',
         'Intermitent',
     ]
+    _dependencies = frozenset({
+        ApiAttrs.PILOT_MODE,
+    })
 
     def __init__(self, coordinator: ProflameDataCoordinator) -> None:
         """Create new instance of the ProflameFlame class."""
@@ -1,12 +1,88 @@
 """Provides light control for Proflame fireplaces."""
-from homeassistant.components.sensor import SensorEntity, SensorEntityDescription
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+import time
+from typing import Any
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EntityCategory, UnitOfInformation, UnitOfTime
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_call_later
 
-from .const import DOMAIN, PROFLAME_COORDINATOR, ApiAttrs
+from .const import (
+    CONF_DEADBAND,
+    CONF_DEADBAND_PERCENT,
+    CONF_MAX_AGE,
+    CONF_MIN_INTERVAL,
+    DOMAIN,
+    PROFLAME_COORDINATOR,
+    SENSOR_FILTER_DEFAULTS,
+    ApiAttrs,
+)
 from .coordinator import ProflameDataCoordinator
 from .entity import ProflameEntity
+from .metrics import ProflameHistogram, ProflameMetrics
+
+
+@dataclass(frozen=True, kw_only=True)
+class ProflameMetricSensorDescription(SensorEntityDescription):
+    """Describes a sensor exposing a runtime metric of the client."""
+
+    value_fn: Callable[[ProflameMetrics], float | int | None]
+
+
+def _counter(key: str, unit: str | None = None) -> ProflameMetricSensorDescription:
+    """Describe a sensor for an ever increasing metric."""
+    return ProflameMetricSensorDescription(
+        device_class=SensorDeviceClass.DATA_SIZE if unit else None,
+        key=key,
+        native_unit_of_measurement=unit,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        translation_key=key,
+        value_fn=lambda metrics: getattr(metrics, key),
+    )
+
+
+def _timing(key: str) -> ProflameMetricSensorDescription:
+    """Describe a sensor for the recent mean of a timing in milliseconds."""
+    def value(metrics: ProflameMetrics) -> float | None:
+        histogram: ProflameHistogram = getattr(metrics, key)
+        mean = histogram.recent_mean
+        return None if mean is None else round(mean * 1000, 3)
+    return ProflameMetricSensorDescription(
+        device_class=SensorDeviceClass.DURATION,
+        key=key,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        translation_key=key,
+        value_fn=value,
+    )
+
+
+METRIC_SENSORS = (
+    _counter('bytes_received', UnitOfInformation.BYTES),
+    _counter('bytes_sent', UnitOfInformation.BYTES),
+    _counter('frames_received'),
+    _counter('frames_sent'),
+    _counter('reconnects'),
+    _timing('callback_time'),
+    _timing('handshake_time'),
+    _timing('queue_wait'),
+    _timing('rtt'),
+    ProflameMetricSensorDescription(
+        key='queue_depth',
+        state_class=SensorStateClass.MEASUREMENT,
+        translation_key='queue_depth',
+        value_fn=lambda metrics: metrics.queue_depth.recent_mean,
+    ),
+)
 
 
 async def async_setup_entry(
@@ -17,30 +93,140 @@ async def async_setup_entry(
     """Create sensors for Proflame fireplaces."""
     entry_id = config_entry.entry_id
     coordinator: ProflameDataCoordinator = hass.data[DOMAIN][entry_id][PROFLAME_COORDINATOR]
+
+    def create(api_attr: ApiAttrs, icon: str) -> ProflameSensor:
+        options = {
+            **SENSOR_FILTER_DEFAULTS[api_attr],
+            **config_entry.options.get(api_attr, {}),
+        }
+        return ProflameSensor(coordinator, api_attr, icon, options)
+
     async_add_entities(x for x in [
-        ProflameSensor(coordinator, ApiAttrs.FREE_HEAP, 'mdi:code-block-tags'),
-        ProflameSensor(coordinator, ApiAttrs.MIN_FREE_HEAP, 'mdi:code-block-tags'),
-        ProflameSensor(coordinator, ApiAttrs.WIFI_SIGNAL_STR, 'mdi:wifi'),
+        create(ApiAttrs.FREE_HEAP, 'mdi:code-block-tags'),
+        create(ApiAttrs.MIN_FREE_HEAP, 'mdi:code-block-tags'),
+        create(ApiAttrs.WIFI_SIGNAL_STR, 'mdi:wifi'),
+        *(ProflameMetricSensor(coordinator, x) for x in METRIC_SENSORS),
     ])
 
 class ProflameSensor(ProflameEntity, SensorEntity):
-    """Creates a sensore for Proflame fireplaces."""
+    """Creates a sensore for Proflame fireplaces.
+
+    Reported values are only published once they move outside the deadband
+    of the last published value, at most once per minimum interval. Any
+    change is published once the last published value is older than the
+    maximum age.
+    """
 
     def __init__(
         self,
         coordinator: ProflameDataCoordinator,
         api_attr: ApiAttrs,
         icon: str = None,
+        options: Mapping[str, Any] | None = None,
     ) -> None:
         """Create new instance of the ProflameSensor class."""
         super().__init__(coordinator, SensorEntityDescription(
             icon=icon,
             key=api_attr,
             translation_key=api_attr,
-        ))
+        ), dependencies=[api_attr])
         self._api_attr = api_attr
+        options = options or {}
+        self._deadband = options.get(CONF_DEADBAND, 0)
+        self._deadband_percent = options.get(CONF_DEADBAND_PERCENT, False)
+        self._max_age = options.get(CONF_MAX_AGE, 0)
+        self._min_interval = options.get(CONF_MIN_INTERVAL, 0)
+        self._cancel_publish = None
+        self._published = None
+        self._published_at = 0.0
+        self._published_flags = None
+
+    def _exceeds_deadband(self, value: int) -> bool:
+        """Return true if a value is far enough from the published value."""
+        if self._published is None or value is None:
+            return True
+        band = self._deadband
+        if self._deadband_percent:
+            band = abs(self._published) * band / 100
+        return abs(value - self._published) > band
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Publish the reported value if it passes the filters."""
+        flags = (self.available, self._device.stale)
+        value = self.raw_value
+        if flags != self._published_flags or self._published is None:
+            self._publish()
+            return
+        if value == self._published:
+            return
+        age = time.monotonic() - self._published_at
+        if not self._exceeds_deadband(value) and age < self._max_age:
+            return
+        if age < self._min_interval:
+            if self._cancel_publish is None:
+                self._cancel_publish = async_call_later(
+                    self.hass, self._min_interval - age, self._publish
+                )
+            return
+        self._publish()
+
+    @callback
+    def _publish(self, _now: Any = None) -> None:
+        """Write the current raw value to the state machine."""
+        if self._cancel_publish is not None:
+            self._cancel_publish()
+            self._cancel_publish = None
+        self._published = self.raw_value
+        self._published_at = time.monotonic()
+        self._published_flags = (self.available, self._device.stale)
+        self.async_write_ha_state()
+
+    async def async_added_to_hass(self) -> None:
+        """Start publishing from the current raw value."""
+        await super().async_added_to_hass()
+        self._published = self.raw_value
+        self._published_at = time.monotonic()
+        self._published_flags = (self.available, self._device.stale)
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Cancel any deferred publish."""
+        if self._cancel_publish is not None:
+            self._cancel_publish()
+            self._cancel_publish = None
+        await super().async_will_remove_from_hass()
 
     @property
     def native_value(self) -> bool | None:
-        """Return the state of the sensor."""
+        """Return the last published state of the sensor."""
+        return self._published
+
+    @property
+    def raw_value(self) -> int | None:
+        """Return the latest value reported by the fireplace."""
         return self._device.get_state(self._api_attr)
+
+
+class ProflameMetricSensor(ProflameEntity, SensorEntity):
+    """Creates a diagnostic sensor for a runtime metric of the connection.
+
+    Metrics change with every frame, so they are polled instead of being
+    written on every coordinator update.
+    """
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _dependencies = frozenset()
+
+    async def async_update(self) -> None:
+        """Read the metric when polled, there is nothing to refresh."""
+
+    @property
+    def native_value(self) -> float | int | None:
+        """Return the current value of the metric."""
+        return self.entity_description.value_fn(self._device.metrics)
+
+    @property
+    def should_poll(self) -> bool:
+        """Poll the metric since coordinator updates skip this sensor."""
+        return True
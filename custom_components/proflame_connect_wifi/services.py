@@ -0,0 +1,117 @@
+"""Services for Proflame fireplaces."""
+import voluptuous as vol
+
+from homeassistant.const import ATTR_DEVICE_ID, UnitOfTemperature
+from homeassistant.core import HomeAssistant, ServiceCall, callback
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv, device_registry as dr
+
+from .client import ProflameClient
+from .const import (
+    ATTR_FAN_SPEED,
+    ATTR_FLAME_HEIGHT,
+    ATTR_LIGHT_BRIGHTNESS,
+    ATTR_PILOT_MODE,
+    ATTR_PRESET,
+    ATTR_TARGET_TEMPERATURE,
+    DOMAIN,
+    MAX_FAN_SPEED,
+    MAX_FLAME_HEIGHT,
+    MAX_LIGHT_BRIGHTNESS,
+    MAX_TEMPERATURE,
+    MIN_FAN_SPEED,
+    MIN_FLAME_HEIGHT,
+    MIN_LIGHT_BRIGHTNESS,
+    MIN_TEMPERATURE,
+    PROFLAME_CLIENT,
+    SERVICE_SET_STATE,
+    PilotMode,
+    Preset,
+)
+from .util import Temperature
+
+SET_STATE_SCHEMA = vol.Schema({
+    vol.Required(ATTR_DEVICE_ID): vol.All(cv.ensure_list, [cv.string]),
+    vol.Optional(ATTR_PRESET): vol.In([x.value for x in Preset]),
+    vol.Optional(ATTR_FLAME_HEIGHT): vol.All(
+        vol.Coerce(int), vol.Range(min=MIN_FLAME_HEIGHT, max=MAX_FLAME_HEIGHT)
+    ),
+    vol.Optional(ATTR_FAN_SPEED): vol.All(
+        vol.Coerce(int), vol.Range(min=MIN_FAN_SPEED, max=MAX_FAN_SPEED)
+    ),
+    vol.Optional(ATTR_LIGHT_BRIGHTNESS): vol.All(
+        vol.Coerce(int), vol.Range(min=MIN_LIGHT_BRIGHTNESS, max=MAX_LIGHT_BRIGHTNESS)
+    ),
+    vol.Optional(ATTR_PILOT_MODE): vol.In([x.name.lower() for x in PilotMode]),
+    vol.Optional(ATTR_TARGET_TEMPERATURE): vol.Coerce(float),
+})
+
+
+def _clients(hass: HomeAssistant, device_ids: list[str]) -> list[ProflameClient]:
+    """Find the clients of the fireplaces targeted by a service call."""
+    registry = dr.async_get(hass)
+    clients = []
+    for device_id in device_ids:
+        device = registry.async_get(device_id)
+        entries = device.config_entries if device else set()
+        found = [
+            hass.data[DOMAIN][x][PROFLAME_CLIENT]
+            for x in entries
+            if x in hass.data.get(DOMAIN, {})
+        ]
+        if not found:
+            raise ServiceValidationError(f"{device_id} is not a loaded Proflame fireplace")
+        clients.extend(found)
+    return clients
+
+
+def _target_temperature(client: ProflameClient, value: float) -> Temperature:
+    """Interpret a target temperature in the unit of the fireplace and check its range."""
+    if client.temperature_unit == UnitOfTemperature.FAHRENHEIT:
+        temperature = Temperature.fahrenheit(value)
+        low, high = MIN_TEMPERATURE.to_fahrenheit(), MAX_TEMPERATURE.to_fahrenheit()
+    else:
+        temperature = Temperature.celcius(value)
+        low, high = MIN_TEMPERATURE.to_celcius(), MAX_TEMPERATURE.to_celcius()
+    if not low <= value <= high:
+        raise ServiceValidationError(
+            f"Target temperature {value} is outside of {low:g}-{high:g} {client.temperature_unit}"
+        )
+    return temperature
+
+
+def _apply(client: ProflameClient, data: dict) -> None:
+    """Stage all requested changes on a single fireplace."""
+    if ATTR_PRESET in data:
+        client.set_preset(Preset(data[ATTR_PRESET]))
+    if ATTR_FLAME_HEIGHT in data:
+        client.set_flame_height(data[ATTR_FLAME_HEIGHT])
+    if ATTR_FAN_SPEED in data:
+        client.set_fan_speed(data[ATTR_FAN_SPEED])
+    if ATTR_LIGHT_BRIGHTNESS in data:
+        client.set_light_brightness(data[ATTR_LIGHT_BRIGHTNESS])
+    if ATTR_PILOT_MODE in data:
+        client.set_pilot_mode(PilotMode[data[ATTR_PILOT_MODE].upper()])
+    if ATTR_TARGET_TEMPERATURE in data:
+        client.set_target_temperature(
+            _target_temperature(client, data[ATTR_TARGET_TEMPERATURE])
+        )
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the services of the integration."""
+
+    @callback
+    def set_state(call: ServiceCall) -> None:
+        """Apply several changes to each fireplace in a single frame."""
+        clients = _clients(hass, call.data[ATTR_DEVICE_ID])
+        # Validate every fireplace before changing any of them
+        if ATTR_TARGET_TEMPERATURE in call.data:
+            for client in clients:
+                _target_temperature(client, call.data[ATTR_TARGET_TEMPERATURE])
+        for client in clients:
+            with client.transaction():
+                _apply(client, call.data)
+
+    hass.services.async_register(DOMAIN, SERVICE_SET_STATE, set_state, schema=SET_STATE_SCHEMA)
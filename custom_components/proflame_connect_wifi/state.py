@@ -0,0 +1,120 @@
+"""Compact storage of the state reported by a Proflame fireplace."""
+from collections.abc import Iterator, Mapping
+from typing import Any
+
+from .const import ApiAttrs
+
+ATTRS = tuple(ApiAttrs)
+ATTR_INDEX = {attr: index for index, attr in enumerate(ATTRS)}
+
+_MISSING = object()
+
+
+class ProflameStateSnapshot(Mapping[str, int]):
+    """Immutable view of fireplace state at a single version."""
+
+    __slots__ = ('_overflow', '_values', 'version')
+
+    def __init__(self, values: list[Any], overflow: dict[str, int], version: int) -> None:
+        """Create new instance of the ProflameStateSnapshot class."""
+        self._overflow = overflow
+        self._values = values
+        self.version = version
+
+    def __getitem__(self, key: str) -> int:
+        """Retrieve the value of a single field."""
+        index = ATTR_INDEX.get(key)
+        if index is None:
+            return self._overflow[key]
+        value = self._values[index]
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over all fields with a known value."""
+        for index, value in enumerate(self._values):
+            if value is not _MISSING:
+                yield ATTRS[index]
+        yield from self._overflow
+
+    def __len__(self) -> int:
+        """Count the fields with a known value."""
+        known = sum(1 for x in self._values if x is not _MISSING)
+        return known + len(self._overflow)
+
+    def __repr__(self) -> str:
+        """Represent the snapshot like the dict it replaces."""
+        return repr(dict(self))
+
+
+class ProflameStateStore:
+    """Fixed layout state store with copy-on-write snapshots.
+
+    Known attributes live in a list indexed by their position in ApiAttrs,
+    anything else the device reports is kept in an overflow dict. Snapshots
+    share the underlying storage, which is only copied by the first write
+    after a snapshot was taken.
+    """
+
+    __slots__ = ('_overflow', '_shared', '_snapshot', '_values', 'version')
+
+    def __init__(self) -> None:
+        """Create new instance of the ProflameStateStore class."""
+        self._overflow: dict[str, int] = {}
+        self._shared = False
+        self._snapshot = None
+        self._values: list[Any] = [_MISSING] * len(ATTRS)
+        self.version = 0
+
+    def __contains__(self, key: str) -> bool:
+        """Return true if the field has a known value."""
+        index = ATTR_INDEX.get(key)
+        if index is None:
+            return key in self._overflow
+        return self._values[index] is not _MISSING
+
+    def diff(self, message: Mapping[str, int]) -> dict[str, int]:
+        """Return the fields of a message whose values differ from the store."""
+        values = self._values
+        overflow = self._overflow
+        changes = {}
+        for key, value in message.items():
+            index = ATTR_INDEX.get(key)
+            current = overflow.get(key, _MISSING) if index is None else values[index]
+            if current is _MISSING or current != value:
+                changes[key] = value
+        return changes
+
+    def get(self, key: str, default: int | None = None) -> int | None:
+        """Retrieve the value of a single field."""
+        index = ATTR_INDEX.get(key)
+        if index is None:
+            return self._overflow.get(key, default)
+        value = self._values[index]
+        return default if value is _MISSING else value
+
+    def snapshot(self) -> ProflameStateSnapshot:
+        """Retrieve an immutable view of the current state without copying it."""
+        snapshot = self._snapshot
+        if snapshot is None or snapshot.version != self.version:
+            snapshot = self._snapshot = ProflameStateSnapshot(
+                self._values, self._overflow, self.version
+            )
+            self._shared = True
+        return snapshot
+
+    def update(self, changes: Mapping[str, int]) -> None:
+        """Apply changed values to the store."""
+        if self._shared:
+            self._values = list(self._values)
+            self._overflow = dict(self._overflow)
+            self._shared = False
+        values = self._values
+        for key, value in changes.items():
+            index = ATTR_INDEX.get(key)
+            if index is None:
+                self._overflow[key] = value
+            else:
+                values[index] = value
+        self.version += 1
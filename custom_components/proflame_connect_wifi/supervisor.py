@@ -0,0 +1,203 @@
+"""Domain wide management of Proflame fireplace connections."""
+import asyncio
+from collections import Counter
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+import logging
+import random
+import time
+
+from .client import ProflameClient
+from .const import (
+    CONNECT_STAGGER,
+    DEFAULT_COALESCE_WINDOW,
+    DEFAULT_COMMAND_TIMEOUT,
+    DEFAULT_OPTIMISTIC_TIMEOUT,
+    DEFAULT_PORT,
+    MAX_CONCURRENT_CONNECTS,
+    ConnectionState,
+    OutboxPolicy,
+)
+from .recorder import ProflameRecorder
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ProflameSupervisor:
+    """Owns all fireplace clients and paces their connection attempts.
+
+    Connection attempts, including the Proflame handshake, are limited to a
+    fixed number at a time. Attempts that have to queue for a slot are spread
+    out with a random delay that grows with the queue, so a restart of Home
+    Assistant or of an access point does not cause a handshake storm.
+
+    Clients acquired through the supervisor are shared by host and port, so
+    every subscriber to the same fireplace uses a single connection. The
+    connection is closed once the last subscriber releases it.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = MAX_CONCURRENT_CONNECTS,
+        stagger: float = CONNECT_STAGGER,
+    ) -> None:
+        """Create new instance of the ProflameSupervisor class."""
+        self._clients: dict[tuple[str, int], ProflameClient] = {}
+        self._max_concurrent = max_concurrent
+        self._recorders: dict[ProflameClient, ProflameRecorder] = {}
+        self._refs: Counter[ProflameClient] = Counter()
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._stagger = stagger
+        self._states: dict[ProflameClient, ConnectionState] = {}
+        self._waiting = 0
+        self._bringup_started = None
+
+    @asynccontextmanager
+    async def _connect_slot(self) -> AsyncIterator[None]:
+        """Wait for a staggered turn to connect to a fireplace."""
+        self._waiting += 1
+        try:
+            if self._waiting > 1:
+                spread = self._stagger * (self._waiting - 1) / self._max_concurrent
+                await asyncio.sleep(random.uniform(0, spread))
+            await self._semaphore.acquire()
+        finally:
+            self._waiting -= 1
+        try:
+            yield
+        finally:
+            self._semaphore.release()
+
+    @staticmethod
+    def _close_recorder(recorder: ProflameRecorder) -> asyncio.Future:
+        """Close a recorder in the executor, its writer thread flushes to disk."""
+        return asyncio.get_running_loop().run_in_executor(None, recorder.close)
+
+    def _track(self, client: ProflameClient, state: ConnectionState) -> None:
+        """Record the connection state of a client and report fleet progress."""
+        if client not in self._states:
+            return
+        self._states[client] = state
+        ready = sum(1 for x in self._states.values() if x == ConnectionState.READY)
+        total = len(self._states)
+        if ready < total and self._bringup_started is None:
+            self._bringup_started = time.monotonic()
+        elif ready == total and self._bringup_started is not None:
+            elapsed = time.monotonic() - self._bringup_started
+            self._bringup_started = None
+            _LOGGER.info('All %s fireplace(s) connected after %.1f seconds', total, elapsed)
+        else:
+            _LOGGER.debug('%s of %s fireplace(s) connected', ready, total)
+
+    def create_client(
+        self,
+        device_id: str,
+        host: str,
+        port: int | None = None,
+        recorder=None,
+        command_timeout: float = DEFAULT_COMMAND_TIMEOUT,
+        outbox_policy: OutboxPolicy = OutboxPolicy.EXPIRE,
+        coalesce_window: float = DEFAULT_COALESCE_WINDOW,
+        optimistic_timeout: float = DEFAULT_OPTIMISTIC_TIMEOUT,
+    ) -> ProflameClient:
+        """Create a client whose connection attempts are paced by the supervisor."""
+        return ProflameClient(
+            device_id=device_id,
+            host=host,
+            port=port,
+            connect_gate=self._connect_slot,
+            recorder=recorder,
+            command_timeout=command_timeout,
+            outbox_policy=outbox_policy,
+            coalesce_window=coalesce_window,
+            optimistic_timeout=optimistic_timeout,
+        )
+
+    def acquire_client(
+        self,
+        device_id: str,
+        host: str,
+        port: int | None = None,
+        recorder=None,
+        command_timeout: float = DEFAULT_COMMAND_TIMEOUT,
+        outbox_policy: OutboxPolicy = OutboxPolicy.EXPIRE,
+        coalesce_window: float = DEFAULT_COALESCE_WINDOW,
+        optimistic_timeout: float = DEFAULT_OPTIMISTIC_TIMEOUT,
+    ) -> ProflameClient:
+        """Retrieve the shared client of a fireplace, creating it for the first subscriber.
+
+        The remaining arguments only apply when the client is created. The
+        supervisor owns the recorder either way: it is closed with the client,
+        or right away if an existing client is shared instead.
+        """
+        key = (host, port or DEFAULT_PORT)
+        client = self._clients.get(key)
+        if client is None:
+            client = self.create_client(
+                device_id,
+                host,
+                port,
+                recorder,
+                command_timeout,
+                outbox_policy,
+                coalesce_window,
+                optimistic_timeout,
+            )
+            self._clients[key] = client
+            if recorder is not None:
+                self._recorders[client] = recorder
+        else:
+            _LOGGER.debug('Sharing the connection to %s:%s', *key)
+            if recorder is not None:
+                self._close_recorder(recorder)
+        self._refs[client] += 1
+        return client
+
+    def find_client(self, host: str, port: int | None = None) -> ProflameClient | None:
+        """Retrieve the shared client of a fireplace if one exists."""
+        return self._clients.get((host, port or DEFAULT_PORT))
+
+    async def async_release(self, client: ProflameClient) -> None:
+        """Drop a subscription to a shared client, closing it with the last one."""
+        self._refs[client] -= 1
+        if self._refs[client] > 0:
+            return
+        del self._refs[client]
+        self._clients = {k: v for k, v in self._clients.items() if v is not client}
+        await self.async_close(client)
+        if (recorder := self._recorders.pop(client, None)) is not None:
+            await self._close_recorder(recorder)
+
+    async def async_open(self, client: ProflameClient) -> None:
+        """Start maintaining the connection of a client, unless already started."""
+        if client in self._states:
+            return
+        self._states[client] = client.connection_state
+        client.register_connection_callback(lambda state: self._track(client, state))
+        await client.open()
+
+    async def async_close(self, client: ProflameClient) -> None:
+        """Stop maintaining the connection of a client."""
+        self._states.pop(client, None)
+        await client.close()
+
+    async def async_shutdown(self) -> None:
+        """Close the connections of all clients."""
+        clients = list(self._states)
+        self._clients.clear()
+        self._refs.clear()
+        self._states.clear()
+        await asyncio.gather(*(x.close() for x in clients), return_exceptions=True)
+        recorders = list(self._recorders.values())
+        self._recorders.clear()
+        await asyncio.gather(*(self._close_recorder(x) for x in recorders))
+
+    @property
+    def progress(self) -> dict[str, int]:
+        """Retrieve the number of clients in each connection state."""
+        counts = Counter(self._states.values())
+        return {
+            'total': len(self._states),
+            'waiting': self._waiting,
+            **{state.value: counts.get(state, 0) for state in ConnectionState},
+        }
@@ -6,7 +6,7 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import DOMAIN, PROFLAME_COORDINATOR, OperatingMode, Preset
+from .const import DOMAIN, PROFLAME_COORDINATOR, ApiAttrs, OperatingMode, Preset
 from .coordinator import ProflameDataCoordinator
 from .entity import ProflameEntity
 from .util import coalesce
@@ -26,6 +26,11 @@ async def async_setup_entry(
 class ProflamePower(ProflameEntity, SwitchEntity):
     """Creates a device to control fireplace lights."""
 
+    _dependencies = frozenset({
+        ApiAttrs.FLAME_HEIGHT,
+        ApiAttrs.OPERATING_MODE,
+    })
+
     def __init__(self, coordinator: ProflameDataCoordinator) -> None:
         """Create new instance of the ProflameFlame class."""
         super().__init__(coordinator, SwitchEntityDescription(
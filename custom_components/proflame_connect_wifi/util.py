@@ -1,5 +1,6 @@
 """General helper objects used by the rest of the module."""
 
+import logging
 from typing import Any, Self
 
 
@@ -18,6 +19,24 @@ def constrain(value: int, min_value: int, max_value: int):
         return max_value
     return value
 
+class ProflameLogger(logging.LoggerAdapter):
+    """Logger adapter that prefixes every message with the fireplace host."""
+
+    def __init__(self, logger: logging.Logger, host: str) -> None:
+        """Create new instance of the ProflameLogger class."""
+        super().__init__(logger, {'host': host})
+        self._prefix = f"PF[{host}] "
+
+    @staticmethod
+    def for_host(logger: logging.Logger, host: str) -> Self:
+        """Create an adapter backed by a child logger dedicated to a single host."""
+        child = logger.getChild(host.replace('.', '_'))
+        return ProflameLogger(child, host)
+
+    def process(self, msg, kwargs):
+        """Add the host prefix to a message that is about to be logged."""
+        return f"{self._prefix}{msg}", kwargs
+
 class Temperature:
     """Helper class for interacting with temperature."""
 
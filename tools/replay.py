@@ -0,0 +1,121 @@
+"""Replay of recorded Proflame sessions.
+
+A recording is fed through the client, coordinator and entities, either at
+its original pace or as fast as possible:
+
+    python -m tools.replay recording.jsonl
+"""
+import argparse
+import asyncio
+from collections.abc import Iterator
+import json
+import logging
+import sys
+import tempfile
+import time
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.proflame_connect_wifi.client import ProflameClient
+from custom_components.proflame_connect_wifi.climate import ProflameClimate
+from custom_components.proflame_connect_wifi.const import RECORD_RECV, SENSOR_FILTER_DEFAULTS
+from custom_components.proflame_connect_wifi.coordinator import ProflameDataCoordinator
+from custom_components.proflame_connect_wifi.fan import ProflameFan
+from custom_components.proflame_connect_wifi.light import ProflameLight
+from custom_components.proflame_connect_wifi.number import ProflameFlame
+from custom_components.proflame_connect_wifi.select import ProflamePilot
+from custom_components.proflame_connect_wifi.sensor import ProflameSensor
+from custom_components.proflame_connect_wifi.switch import ProflamePower
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def read_recording(path: str) -> Iterator[tuple[float, str, str]]:
+    """Read the frames of a recording in order."""
+    with open(path, encoding='utf-8') as file:
+        for line in file:
+            if line.strip():
+                timestamp, direction, message = json.loads(line)
+                yield timestamp, direction, message
+
+
+async def replay(path: str, client: ProflameClient, speed: float | None = None) -> int:
+    """Feed the received frames of a recording to a client.
+
+    Frames are replayed at the original pace multiplied by speed, or as fast
+    as possible without a speed. Returns the number of frames replayed.
+    """
+    count = 0
+    previous = None
+    for timestamp, direction, message in read_recording(path):
+        if direction != RECORD_RECV:
+            continue
+        if speed and previous is not None and timestamp > previous:
+            await asyncio.sleep((timestamp - previous) / speed)
+        previous = timestamp
+        client._handle_message(message)  # pylint: disable=protected-access
+        count += 1
+    return count
+
+
+async def _run(args: argparse.Namespace) -> None:
+    """Replay a recording through the client, coordinator and entities."""
+    hass = HomeAssistant(tempfile.gettempdir())
+    client = ProflameClient('replay', '127.0.0.1')
+    coordinator = ProflameDataCoordinator(hass, client, 'Replay')
+    entities = [
+        ('climate', ProflameClimate(coordinator)),
+        ('fan', ProflameFan(coordinator)),
+        ('light', ProflameLight(coordinator)),
+        ('number', ProflameFlame(coordinator)),
+        ('select', ProflamePilot(coordinator)),
+        ('switch', ProflamePower(coordinator)),
+        *(('sensor', ProflameSensor(coordinator, k, None, v)) for k, v in SENSOR_FILTER_DEFAULTS.items()),
+    ]
+    for domain, entity in entities:
+        # Entities are not added to a platform, so they cannot be named by translations
+        entity.hass = hass
+        entity.entity_id = f"{domain}.replay_{entity.entity_description.key}"
+        entity._attr_name = entity.entity_description.key  # pylint: disable=protected-access
+        await entity.async_added_to_hass()
+    writes = 0
+
+    def count_writes(event) -> None:
+        nonlocal writes
+        writes += 1
+    hass.bus.async_listen('state_changed', count_writes)
+
+    start = time.perf_counter()
+    frames = await replay(args.recording, client, args.speed)
+    elapsed = time.perf_counter() - start
+    await hass.async_block_till_done()
+    _LOGGER.info(
+        'Replayed %s frame(s) in %.3f seconds (%.1f us per frame), %s state write(s)',
+        frames,
+        elapsed,
+        elapsed / frames * 1e6 if frames else 0,
+        writes,
+    )
+    await hass.async_stop(force=True)
+
+
+def main() -> int:
+    """Command line entry point for replaying a recording."""
+    parser = argparse.ArgumentParser(description='Replay a recorded Proflame session.')
+    parser.add_argument('recording')
+    parser.add_argument(
+        '--speed',
+        type=float,
+        default=None,
+        help='Replay at this multiple of the original pace instead of as fast as possible',
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    logging.getLogger('homeassistant').setLevel(logging.ERROR)
+    asyncio.run(_run(args))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
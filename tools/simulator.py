@@ -0,0 +1,289 @@
+"""Local stand-in for the websocket server of a Proflame fireplace.
+
+The simulator speaks the same protocol as the fireplace so the client can be
+exercised without hardware, either from tests:
+
+    async with ProflameSimulator(latency=0.05) as sim:
+        client = ProflameClient('test', sim.host, sim.port)
+
+or from the command line:
+
+    python -m tools.simulator --port 8888
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import logging
+import random
+
+from websockets import ConnectionClosed
+from websockets.server import WebSocketServerProtocol, serve
+
+from custom_components.proflame_connect_wifi.const import ApiAttrs, ApiControl
+
+_LOGGER = logging.getLogger(__name__)
+
+CONNECTION_HEAP = 24000
+DEFAULT_HEAP_SIZE = 160000
+HEAP_FLOOR = 40000
+
+DEFAULT_STATE = {
+    ApiAttrs.AUXILIARY: 0,
+    ApiAttrs.BURNER_STATUS: 0,
+    ApiAttrs.CURRENT_TEMPERATURE: 210,
+    ApiAttrs.FAN_SPEED: 0,
+    ApiAttrs.FIRMWARE_REVISION: 1006,
+    ApiAttrs.FLAME_HEIGHT: 0,
+    ApiAttrs.FREE_HEAP: DEFAULT_HEAP_SIZE,
+    ApiAttrs.LIGHT_BRIGHTNESS: 0,
+    ApiAttrs.MIN_FREE_HEAP: DEFAULT_HEAP_SIZE,
+    ApiAttrs.OPERATING_MODE: 0,
+    ApiAttrs.PILOT_MODE: 0,
+    ApiAttrs.REMOTE_CONTROL: 0,
+    ApiAttrs.SPLIT_FLOW: 0,
+    ApiAttrs.TARGET_TEMPERATURE: 220,
+    ApiAttrs.TEMPERATURE_UNIT: 0,
+    ApiAttrs.WIFI_SIGNAL_STR: -55,
+}
+
+
+class _Session:
+    """A single client connection and its delayed outbound queue."""
+
+    def __init__(self, websocket: WebSocketServerProtocol) -> None:
+        """Create new instance of the _Session class."""
+        self.websocket = websocket
+        self.outbound = asyncio.Queue()
+        self.pending_bytes = 0
+
+
+class ProflameSimulator:
+    """Simulated Proflame fireplace websocket server."""
+
+    def __init__(
+        self,
+        host: str = '127.0.0.1',
+        port: int = 0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        drop_rate: float = 0.0,
+        heap_size: int = DEFAULT_HEAP_SIZE,
+        telemetry_interval: float | None = None,
+        state: dict[str, int] | None = None,
+        seed: int | None = None,
+    ) -> None:
+        """Create new instance of the ProflameSimulator class."""
+        self.drop_rate = drop_rate
+        self.heap_size = heap_size
+        self.host = host
+        self.jitter = jitter
+        self.latency = latency
+        self.port = port
+        self.telemetry_interval = telemetry_interval
+
+        self.state = {**DEFAULT_STATE, **(state or {})}
+        self.state[ApiAttrs.FREE_HEAP] = heap_size
+        self.state[ApiAttrs.MIN_FREE_HEAP] = heap_size
+
+        self.connections = 0
+        self.dropped = 0
+        self.frames_received = 0
+        self.frames_sent = 0
+        self.rejected = 0
+
+        self._random = random.Random(seed)
+        self._server = None
+        self._sessions: set[_Session] = set()
+        self._tasks: set[asyncio.Task] = set()
+
+    async def __aenter__(self):
+        """Start the simulator for an async context manager."""
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, exc_tb):
+        """Stop the simulator on async context manager exit."""
+        await self.stop()
+
+    @property
+    def clients(self) -> int:
+        """Number of currently connected clients."""
+        return len(self._sessions)
+
+    @property
+    def free_heap(self) -> int:
+        """Heap left after accounting for open connections and buffered frames."""
+        used = sum(CONNECTION_HEAP + x.pending_bytes for x in self._sessions)
+        return max(self.heap_size - used, 0)
+
+    @property
+    def uri(self) -> str:
+        """The formatted URI for connecting to the simulator."""
+        return f"ws://{self.host}:{self.port}"
+
+    def _dropped(self) -> bool:
+        """Decide if a message is lost on the simulated network."""
+        if self.drop_rate and self._random.random() < self.drop_rate:
+            self.dropped += 1
+            return True
+        return False
+
+    def _update_heap(self) -> None:
+        """Refresh the reported heap values from the heap model."""
+        free = self.free_heap
+        self.state[ApiAttrs.FREE_HEAP] = free
+        self.state[ApiAttrs.MIN_FREE_HEAP] = min(self.state[ApiAttrs.MIN_FREE_HEAP], free)
+
+    def _enqueue(self, session: _Session, message: str) -> None:
+        """Queue a message to be delivered to a client after the simulated delay."""
+        if self._dropped():
+            return
+        session.pending_bytes += len(message)
+        session.outbound.put_nowait(message)
+        self._update_heap()
+
+    async def _sender(self, session: _Session) -> None:
+        """Deliver queued messages to a client in order with simulated latency."""
+        while True:
+            message = await session.outbound.get()
+            delay = self.latency + self._random.uniform(0, self.jitter)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            session.pending_bytes -= len(message)
+            await session.websocket.send(message)
+            self.frames_sent += 1
+
+    def _apply(self, session: _Session, message: str) -> None:
+        """Handle a message received from a client."""
+        if message == ApiControl.CONN_SYN:
+            self._enqueue(session, ApiControl.CONN_ACK)
+            self._enqueue(session, json.dumps(self.state))
+        elif message == ApiControl.PING:
+            self._enqueue(session, ApiControl.PONG)
+        else:
+            try:
+                changes = json.loads(message)
+            except json.JSONDecodeError:
+                _LOGGER.warning('Simulator received unexpected message (%s)', message)
+                return
+            self.set_state(**changes)
+
+    async def _handler(self, websocket: WebSocketServerProtocol) -> None:
+        """Serve a single client connection."""
+        if self.free_heap - CONNECTION_HEAP < HEAP_FLOOR:
+            self.rejected += 1
+            await websocket.close(code=1013, reason='Out of memory')
+            return
+
+        session = _Session(websocket)
+        self._sessions.add(session)
+        self.connections += 1
+        self._update_heap()
+        sender = asyncio.create_task(self._sender(session))
+        try:
+            async for message in websocket:
+                self.frames_received += 1
+                if not self._dropped():
+                    self._apply(session, message)
+        except ConnectionClosed:
+            pass
+        finally:
+            sender.cancel()
+            self._sessions.discard(session)
+            self._update_heap()
+
+    async def _telemetry(self) -> None:
+        """Periodically report diagnostic values like the real device does."""
+        while True:
+            await asyncio.sleep(self.telemetry_interval)
+            signal = self.state[ApiAttrs.WIFI_SIGNAL_STR] + self._random.randint(-2, 2)
+            self._update_heap()
+            self.broadcast({
+                ApiAttrs.FREE_HEAP: self.state[ApiAttrs.FREE_HEAP],
+                ApiAttrs.MIN_FREE_HEAP: self.state[ApiAttrs.MIN_FREE_HEAP],
+                ApiAttrs.WIFI_SIGNAL_STR: max(min(signal, -30), -90),
+            })
+
+    def broadcast(self, changes: dict[str, int]) -> None:
+        """Apply state changes on the device side and report them to all clients."""
+        self.state.update(changes)
+        message = json.dumps(changes)
+        for session in self._sessions:
+            self._enqueue(session, message)
+
+    async def disconnect(self) -> None:
+        """Force all connected clients to be disconnected."""
+        await asyncio.gather(
+            *(x.websocket.close(code=1001) for x in list(self._sessions)),
+            return_exceptions=True,
+        )
+
+    def set_state(self, **changes: int) -> None:
+        """Apply changes as if they were requested by a client and echo them."""
+        applied = {k: v for k, v in changes.items() if isinstance(v, int)}
+        if applied:
+            self.broadcast(applied)
+
+    async def start(self) -> None:
+        """Start listening for connections."""
+        self._server = await serve(self._handler, self.host, self.port, ping_interval=None)
+        self.port = self._server.sockets[0].getsockname()[1]
+        if self.telemetry_interval:
+            task = asyncio.create_task(self._telemetry())
+            self._tasks.add(task)
+        _LOGGER.info('Proflame simulator listening on %s', self.uri)
+
+    async def stop(self) -> None:
+        """Disconnect all clients and stop listening."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+
+async def _run(args: argparse.Namespace) -> None:
+    """Run the simulator until interrupted."""
+    simulator = ProflameSimulator(
+        host=args.host,
+        port=args.port,
+        latency=args.latency,
+        jitter=args.jitter,
+        drop_rate=args.drop_rate,
+        heap_size=args.heap_size,
+        telemetry_interval=args.telemetry_interval,
+        seed=args.seed,
+    )
+    async with simulator:
+        while True:
+            await asyncio.sleep(args.disconnect_every or 3600)
+            if args.disconnect_every:
+                _LOGGER.info('Forcing disconnect of %s client(s)', simulator.clients)
+                await simulator.disconnect()
+
+
+def main() -> None:
+    """Command line entry point for the simulator."""
+    parser = argparse.ArgumentParser(description='Simulate a Proflame fireplace websocket.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8888)
+    parser.add_argument('--latency', type=float, default=0.0, help='Delay in seconds before each reply')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Maximum random extra delay in seconds')
+    parser.add_argument('--drop-rate', type=float, default=0.0, help='Probability of losing a message')
+    parser.add_argument('--disconnect-every', type=float, default=None, help='Seconds between forced disconnects')
+    parser.add_argument('--heap-size', type=int, default=DEFAULT_HEAP_SIZE)
+    parser.add_argument('--telemetry-interval', type=float, default=10.0)
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(_run(args))
+
+
+if __name__ == '__main__':
+    main()